@@ -17,6 +17,25 @@ SUPPORTED_OPERATORS = {
 }
 
 
+def parse_condition(condition_str):
+    """
+    Splits a condition string like '<=3' into its operator string and integer value.
+    Returns None if the condition cannot be parsed.
+    """
+    condition_str = condition_str.strip()
+    # Find the operator by checking for 2-char operators first
+    op_str = next((op for op in ['<=', '>=', '==', '!='] if op in condition_str), None)
+    if not op_str:  # If not a 2-char op, check for 1-char op
+        op_str = next((op for op in ['<', '>', '='] if op in condition_str), None)
+
+    if op_str and op_str in SUPPORTED_OPERATORS:
+        try:
+            return op_str, int(condition_str.replace(op_str, ''))
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
 class Config:
     """An object to hold all configuration settings for a generation run."""
 
@@ -64,6 +83,31 @@ class Config:
         self.generation_params = {
             "min_credit": kwargs.get('min_credit', 30),
             "max_credit": kwargs.get('max_credit', 42),
+            # Enforce the display filters during generation instead of only afterwards
+            "apply_filters_during_search": kwargs.get('apply_filters_during_search', True),
+            # Worker processes for the search (1 keeps it in the calling thread, as do searches estimated
+            # too small to gain from workers)
+            "workers": kwargs.get('workers', 1),
+            # Search the most constrained requirements first; programs arrive in a different order
+            "reorder_search": kwargs.get('reorder_search', True),
+            # Merge sections of a course that meet at the same times and list them as alternatives
+            "collapse_equivalent_sections": kwargs.get('collapse_equivalent_sections', False),
+            # Only count the programs instead of generating and listing them
+            "count_only": kwargs.get('count_only', False),
+            # Count first and refuse to generate when the run would list more programs (None for no limit).
+            # With collapse_equivalent_sections, a program standing for several equivalent sections counts once.
+            "max_programs": kwargs.get('max_programs', None),
+            # Seconds between saves of a full run's progress to cache_dir, so an interrupted run can resume
+            # (None, the default, saves no progress)
+            "checkpoint_interval": kwargs.get('checkpoint_interval', None),
+            # Refuse runs expected to keep more programs than fit in this many megabytes (None for no limit)
+            "memory_budget_mb": kwargs.get('memory_budget_mb', None),
+            # Draw this many programs uniformly at random instead of generating all of them (None for all)
+            "sample_size": kwargs.get('sample_size', None),
+            # Seed of the random sample; the same seed draws the same programs
+            "sample_seed": kwargs.get('sample_seed', 0),
+            # Seconds the search may run before the best programs found so far are listed (None for no limit)
+            "time_budget": kwargs.get('time_budget', None),
         }
 
         self.display_params = {
@@ -71,6 +115,9 @@ class Config:
             "include_schedule": True,
             "sort_key": kwargs.get('sort_key', "total_days"),
             "sort_reverse": kwargs.get('sort_reverse', False),
+            # Show only the programs no other program beats on all of these keys, smaller being better
+            # (e.g. ["total_days", "total_hours", "idle_minutes"]; None to show every program)
+            "pareto_metrics": kwargs.get('pareto_metrics', None),
             "filters": {
                 "day_num_condition": kwargs.get('day_num_condition', None),
                 "day_specific_conditions": kwargs.get('day_specific_conditions', None),
@@ -83,6 +130,7 @@ class Config:
         # --- Derived, Processed Functions (built by update()) ---
         self.filter_function = None
         self.filter_description = "None"
+        self.search_constraints = None
         self.sort_function = None
         self.loc = None # This will be set by the App controller
 
@@ -106,23 +154,16 @@ class Config:
         # --- 1. Day Condition Filter ---
         num_cond = self.display_params['filters'].get('day_num_condition')
         if num_cond:
-            condition_str = num_cond.strip()
-            # Find the operator by checking for 2-char operators first
-            op_str = next((op for op in ['<=', '>=', '==', '!='] if op in condition_str), None)
-            if not op_str:  # If not a 2-char op, check for 1-char op
-                op_str = next((op for op in ['<', '>', '='] if op in condition_str), None)
-
-            if op_str and op_str in SUPPORTED_OPERATORS:
-                try:
-                    value = int(condition_str.replace(op_str, ''))
-                    op_func = SUPPORTED_OPERATORS[op_str]
+            parsed = parse_condition(num_cond)
+            if parsed:
+                op_str, value = parsed
+                op_func = SUPPORTED_OPERATORS[op_str]
 
-                    # Create the actual function for this filter
-                    filters.append(lambda p, op=op_func, v=value: op(p['total_days'], v))
-                    descriptions.append(loc.get_string('filter_desc_total_days', op=op_str, val=value))
-
-                except (ValueError, TypeError):
-                    print(f"Warning: Could not parse day number condition '{condition_str}'. Skipping this filter.")
+                # Create the actual function for this filter
+                filters.append(lambda p, op=op_func, v=value: op(p['total_days'], v))
+                descriptions.append(loc.get_string('filter_desc_total_days', op=op_str, val=value))
+            elif any(op in num_cond for op in SUPPORTED_OPERATORS):
+                print(f"Warning: Could not parse day number condition '{num_cond.strip()}'. Skipping this filter.")
 
         # --- 2. Day SPECIFIC Condition Filter (NEW LOGIC) ---
         day_conds = self.display_params['filters'].get('day_specific_conditions')
@@ -171,19 +212,44 @@ class Config:
 
         def final_filter(program):
             # The program passes if ALL individual filter functions return True
-            program_courses_set = set(program['courses'])
-            program_days_set = set(d['day'] for d in program['schedule']) # Calculate program days
-
-            # We pass a modified program object with a pre-calculated set for efficiency
+            # We pass the filters a small view with pre-calculated sets for efficiency
             program_with_sets = {
-                **program,
-                'courses': program_courses_set,
-                'days': program_days_set
+                'courses': set(program['courses']),
+                'days': program['days'],  # Day names the program meets on
+                'total_days': program['total_days']
             }
             return all(f(program_with_sets) for f in filters)
 
         return (final_filter, loc.get_string('filter_desc_and').join(descriptions))
 
+    def _build_search_constraints(self):
+        """
+        Translates the active display filters into constraints the generator can enforce
+        while it searches, so filtered-out programs are never built.
+        Returns None if no filter is active, or if pushing filters into the search is disabled.
+        A random sample is always drawn from the filtered programs, so sampling enables them.
+        """
+        if not (self.generation_params.get("apply_filters_during_search") or self.generation_params.get("sample_size")):
+            return None
+
+        filters = self.display_params['filters']
+        day_conds = filters.get('day_specific_conditions') or {}
+        num_cond = filters.get('day_num_condition')
+        day_num_condition = parse_condition(num_cond) if num_cond else None
+
+        # Sorted tuples keep the constraints comparable and hashable for the program cache
+        constraints = {
+            "exclude_courses": tuple(sorted(filters.get('exclude_courses') or ())),
+            "include_courses": tuple(sorted(filters.get('include_courses') or ())),
+            "must_courses": tuple(sorted(filters.get('must_courses') or ())),
+            "required_days": tuple(sorted(day for day, state in day_conds.items() if state == 1)),
+            "forbidden_days": tuple(sorted(day for day, state in day_conds.items() if state == 2)),
+            "day_num_condition": day_num_condition,
+        }
+        if not any(constraints.values()):
+            return None
+        return constraints
+
     def update(self):
         """
         Builds the derived configuration values (like full paths and lambda functions)
@@ -224,6 +290,7 @@ class Config:
 
         # --- 4. Build filter and sort functions ---
         self.filter_function, self.filter_description = self._build_filter_function()
+        self.search_constraints = self._build_search_constraints()
         sort_key = self.display_params.get("sort_key")
         self.sort_function = itemgetter(sort_key) if sort_key else None
 
@@ -0,0 +1,108 @@
+# src/conflict_graph.py
+"""Pairwise time conflicts between the sections of a catalog, stored as integer bitsets."""
+
+
+class ConflictGraph:
+    """
+    Which sections of a catalog clash with which, computed once from their occupancy masks.
+
+    Section i is codes[i], and adjacency[i] has bit j set when sections i and j meet at the
+    same time. Sections of the same course do not clash unless their times overlap; keeping
+    them apart is up to the search.
+    """
+
+    def __init__(self, codes, adjacency):
+        """
+        Args:
+            codes (list): Full course codes, in index order.
+            adjacency (list): One bitset per section, over the same indices.
+        """
+        self.codes = list(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.adjacency = list(adjacency)
+
+    @classmethod
+    def from_courses(cls, courses):
+        """
+        Builds the graph of parsed courses.
+
+        Each occupied time slot collects the sections meeting in it, and a section clashes with
+        everything found in its slots, so the work grows with the sections' hours rather than
+        with the number of pairs.
+
+        Args:
+            courses (dict): CourseSection objects keyed by full course code.
+
+        Returns:
+            ConflictGraph: The graph, indexed in the order of `courses`.
+        """
+        return cls.from_time_masks(courses, [section.time_mask for section in courses.values()])
+
+    @classmethod
+    def from_time_masks(cls, codes, time_masks):
+        """
+        Builds the graph of sections given by their codes and weekly occupancy masks.
+
+        Args:
+            codes (list): Full course codes, in index order.
+            time_masks (list): The occupancy mask of each section (see time_masks.schedule_to_mask).
+
+        Returns:
+            ConflictGraph: The graph, indexed in the order of `codes`.
+        """
+        occupants = {}  # Slot bit -> bitset of the sections meeting in that slot
+        for i, mask in enumerate(time_masks):
+            while mask:
+                slot = mask & -mask
+                occupants[slot] = occupants.get(slot, 0) | (1 << i)
+                mask ^= slot
+
+        adjacency = []
+        for i, mask in enumerate(time_masks):
+            clashes = 0
+            while mask:
+                slot = mask & -mask
+                clashes |= occupants[slot]
+                mask ^= slot
+            adjacency.append(clashes & ~(1 << i))
+        return cls(codes, adjacency)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def clashes(self, code):
+        """Returns the codes of the sections that clash with a section, in catalog order."""
+        return [self.codes[i] for i in _bit_indices(self.adjacency[self.index[code]])]
+
+    def masks_for(self, codes):
+        """
+        Restricts the graph to some of its sections and renumbers them.
+
+        Args:
+            codes (list): Full course codes, all in the graph. Their order gives the new indices.
+
+        Returns:
+            list: For each code, the bitset of the given codes it clashes with, over the new indices.
+        """
+        renumber = {self.index[code]: k for k, code in enumerate(codes)}
+        group = 0
+        for i in renumber:
+            group |= 1 << i
+        masks = []
+        for code in codes:
+            mask = 0
+            for i in _bit_indices(self.adjacency[self.index[code]] & group):
+                mask |= 1 << renumber[i]
+            masks.append(mask)
+        return masks
+
+
+def _bit_indices(bits):
+    """Yields the indices of the set bits of an integer, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
@@ -1,6 +1,14 @@
+from src.conflict_graph import ConflictGraph
+from src.time_masks import schedule_to_mask, schedule_to_day_mask, schedule_minutes
+
+
 class CourseSection:
     """Represents a specific section of a course."""
 
+    __slots__ = ("full_course_code", "section_no", "course_name", "course_id", "ects_credits", "schedule", "time_mask",
+                 "day_mask", "weekly_minutes", "subject_code", "course_number", "faculty", "instructor_full_name",
+                 "corequisites", "prerequisites", "description")
+
     def __init__(self, full_course_code, ects_credits, schedule, section_no, course_name, course_id, subject_code, course_number,
                  faculty, instructor_full_name, corequisites, prerequisites, description):
         """
@@ -10,6 +18,7 @@ class CourseSection:
             full_course_code (str): The full course code including section (e.g., "PSY 325.A").
             section_no (str): The section identifier (e.g., "A").
             course_name (str): The title of the course.
+            course_id (str): The course identifier without section (e.g., "PSY 325").
             ects_credits (int): The number of credits for the course section.
             schedule (list): A list of schedule dictionaries (e.g., [{'day': 'Monday', 'interval': '09.00-10.00'}]).
             subject_code (str): The subject code (e.g., "PSY").
@@ -24,8 +33,12 @@ class CourseSection:
         self.full_course_code = full_course_code
         self.section_no = section_no
         self.course_name = course_name
+        self.course_id = course_id
         self.ects_credits = ects_credits
         self.schedule = schedule
+        self.time_mask = schedule_to_mask(schedule)  # Weekly occupancy bitmask, used for conflict checks
+        self.day_mask = schedule_to_day_mask(schedule)  # One bit per day the section meets on
+        self.weekly_minutes = schedule_minutes(schedule)  # Scheduled minutes per week
         self.subject_code = subject_code
         self.course_number = course_number
         self.faculty = faculty
@@ -39,6 +52,52 @@ class CourseSection:
         return f"<CourseSection: {self.full_course_code}>"
 
 
+class CourseTable:
+    """
+    The sections of a catalog stored column-wise under integer IDs, for the program search.
+
+    Section i has the code codes[i] and the values credits[i], time_masks[i], day_masks[i],
+    minutes[i] and schedules[i]. Sections of the same course share group_ids[i], and
+    conflict_masks[i] is the bitset of section IDs that clash with section i. The search
+    works on IDs only; codes and schedules are looked up when a program is reported.
+    """
+
+    def __init__(self, courses, conflict_graph=None):
+        """
+        Builds the table from parsed courses.
+
+        Args:
+            courses (dict): CourseSection objects keyed by full course code. IDs follow its order.
+            conflict_graph (ConflictGraph, optional): The catalog's precomputed conflict graph.
+                Conflicts are computed from the sections themselves, the first time they are
+                needed, when it is not given or does not cover every section.
+        """
+        self.codes = list(courses)
+        self.ids = {code: section_id for section_id, code in enumerate(self.codes)}
+        sections = list(courses.values())
+        self.credits = [int(section.ects_credits) for section in sections]
+        self.time_masks = [section.time_mask for section in sections]
+        self.day_masks = [section.day_mask for section in sections]
+        self.minutes = [section.weekly_minutes for section in sections]
+        self.schedules = [section.schedule for section in sections]
+        group_index = {}
+        self.group_ids = [group_index.setdefault(section.course_id, len(group_index)) for section in sections]
+        self.has_siblings = len(group_index) < len(sections)  # Whether any course has two sections here
+        self._conflict_masks = None
+        if conflict_graph is not None and all(code in conflict_graph for code in self.codes):
+            self._conflict_masks = conflict_graph.masks_for(self.codes)
+
+    @property
+    def conflict_masks(self):
+        """For each section, the bitset of section IDs that clash with it."""
+        if self._conflict_masks is None:
+            self._conflict_masks = ConflictGraph.from_time_masks(self.codes, self.time_masks).adjacency
+        return self._conflict_masks
+
+    def __len__(self):
+        return len(self.codes)
+
+
 class Course:
     """Represents a general course (without section), holding multiple CourseSection objects."""
 
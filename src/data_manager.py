@@ -3,7 +3,16 @@ import json
 import os
 import pickle
 import hashlib
+from src.conflict_graph import ConflictGraph
 from src.course_models import CourseSection
+from src.search_checkpoint import SearchCheckpoint
+
+# Bump whenever CourseSection gains or changes precomputed fields, so stale course caches are re-parsed.
+COURSE_CACHE_VERSION = 6
+# Bump whenever the stored program representation changes, so stale program caches are regenerated.
+PROGRAM_CACHE_VERSION = 3
+# Bump whenever the conflict rules or the stored graph change, so stale conflict graphs are rebuilt.
+CONFLICT_GRAPH_VERSION = 1
 
 # --- NEW: Helper function to get a file's hash for validation ---
 def _get_file_hash(filepath):
@@ -76,12 +85,12 @@ def load_and_parse_courses(config_obj):
         try:
             with open(cache_filepath, 'rb') as f:
                 cached_data = pickle.load(f)
-            # Validate that the source file has not changed
-            if cached_data.get('hash') == current_file_hash:
+            # Validate that the source file has not changed and the cache format is current
+            if cached_data.get('hash') == current_file_hash and cached_data.get('version') == COURSE_CACHE_VERSION:
                 print("Course cache is valid. Loading all courses from cache.")
                 return cached_data['courses']
             else:
-                print("Course cache is stale (source file changed). Re-parsing.")
+                print("Course cache is stale (source file or cache format changed). Re-parsing.")
         except Exception as e:
             print(f"Could not load course cache ({e}). Re-parsing.")
 
@@ -91,7 +100,7 @@ def load_and_parse_courses(config_obj):
 
     # Save the newly parsed data to the cache for next time
     try:
-        data_to_save = {'hash': current_file_hash, 'courses': all_courses}
+        data_to_save = {'hash': current_file_hash, 'version': COURSE_CACHE_VERSION, 'courses': all_courses}
         with open(cache_filepath, 'wb') as f:
             pickle.dump(data_to_save, f)
         print(f"Saved parsed course data to cache: '{cache_filename}'")
@@ -100,6 +109,72 @@ def load_and_parse_courses(config_obj):
 
     return all_courses
 
+def load_conflict_graph(config_obj, all_courses):
+    """
+    Loads the conflict graph of the courses file, building and caching it when the cached one
+    is missing or the source file has changed. It sits next to the course cache in cache_dir.
+
+    Args:
+        config_obj (Config): The updated config, for the courses file and cache_dir paths.
+        all_courses (dict): Every CourseSection of the courses file, as from load_and_parse_courses.
+
+    Returns:
+        ConflictGraph: The pairwise conflicts between all sections of the courses file.
+    """
+    courses_filepath = config_obj.input["courses"]["filepath"]
+    base_name = os.path.splitext(os.path.basename(courses_filepath))[0]
+    cache_filename = f"cache_conflicts_{base_name}.pkl"
+    cache_filepath = os.path.join(config_obj.paths["cache_dir"], cache_filename)
+
+    current_file_hash = _get_file_hash(courses_filepath)
+
+    if os.path.exists(cache_filepath):
+        try:
+            with open(cache_filepath, 'rb') as f:
+                cached_data = pickle.load(f)
+            if (cached_data.get('hash') == current_file_hash and cached_data.get('version') == CONFLICT_GRAPH_VERSION
+                    and cached_data['graph'].codes == list(all_courses)):
+                return cached_data['graph']
+            print("Conflict graph cache is stale. Rebuilding.")
+        except Exception as e:
+            print(f"Could not load conflict graph cache ({e}). Rebuilding.")
+
+    graph = ConflictGraph.from_courses(all_courses)
+    try:
+        data_to_save = {'hash': current_file_hash, 'version': CONFLICT_GRAPH_VERSION, 'graph': graph}
+        with open(cache_filepath, 'wb') as f:
+            pickle.dump(data_to_save, f)
+        print(f"Saved course conflict graph to cache: '{cache_filename}'")
+    except Exception as e:
+        print(f"Error saving conflict graph to cache: {e}")
+
+    return graph
+
+def open_checkpoint(config_obj, requirements, constraints=None):
+    """
+    Returns the checkpoint of a generation run, loaded when an earlier run with the same inputs
+    was interrupted. Its file in cache_dir is named after a hash of everything the result depends
+    on, so runs with different requirements, credits, filters or courses files keep separate checkpoints.
+
+    Args:
+        config_obj (Config): The updated config, for the courses file, cache_dir and generation_params.
+        requirements (list): The requirement dictionaries as loaded from the JSON file.
+        constraints (dict, optional): The search constraints of the run.
+
+    Returns:
+        SearchCheckpoint: The checkpoint, with the saved progress loaded if there is any.
+    """
+    gen_params = config_obj.generation_params
+    identity = {"courses": _get_file_hash(config_obj.input["courses"]["filepath"]), "requirements": requirements,
+                "credits": (gen_params["min_credit"], gen_params["max_credit"]), "constraints": constraints,
+                "collapse_equivalent": gen_params["collapse_equivalent_sections"],
+                "reorder": gen_params["reorder_search"], "version": PROGRAM_CACHE_VERSION}
+    key = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+    checkpoint_path = os.path.join(config_obj.paths["cache_dir"], f"checkpoint_{key}.pkl")
+    checkpoint = SearchCheckpoint(checkpoint_path, identity, gen_params["checkpoint_interval"])
+    checkpoint.load()
+    return checkpoint
+
 # --- This function remains the same ---
 def load_requirements_from_json(filepath):
     try:
@@ -123,11 +198,18 @@ def load_possible_programs(file_path):
         return None
 
 # --- MODIFIED --- This function now saves the programs along with metadata
-def save_possible_programs(programs, file_path, requirements, min_credit, max_credit):
-    """Saves possible programs along with their generation metadata to a pickle file."""
+def save_possible_programs(programs, file_path, requirements, min_credit, max_credit, constraints=None,
+                           collapse_equivalent=False):
+    """
+    Saves possible programs along with their generation metadata to a pickle file.
+    'programs' is a ProgramSet; it pickles as section IDs and stat columns plus one course table.
+    'constraints' are the search constraints the programs were generated under (None if unfiltered).
+    'collapse_equivalent' records whether equivalent sections were merged into alternatives.
+    """
 
     data_to_save = {
-        "metadata": {"requirements": requirements, "credits": (min_credit, max_credit)},
+        "metadata": {"requirements": requirements, "credits": (min_credit, max_credit), "constraints": constraints,
+                     "collapse_equivalent": collapse_equivalent, "version": PROGRAM_CACHE_VERSION},
         "programs": programs
     }
 
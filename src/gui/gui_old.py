@@ -664,7 +664,7 @@ class Screen3(ttk.Frame):
             cache_filepath = self._generate_cache_filename()
             config_obj.input["cache"]["filepath"] = cache_filepath
             print("Configuration updated. Starting generation process...\n")
-            summarized_programs, results_output, auto_save_path = run_program_generation(config_obj)
+            summarized_programs, results_output, auto_save_path, _ = run_program_generation(config_obj)
             self.queue.put((summarized_programs, results_output, auto_save_path))
         except ValueError:
             self.queue.put(
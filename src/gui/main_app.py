@@ -1,3 +1,4 @@
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk
 import webbrowser
@@ -26,6 +27,7 @@ class App(tk.Tk):
         self.config.loc = self.loc # Attach localization manager to config
         self.config.update()  # Initial update to build paths
         self.all_courses_list = {}
+        self.conflict_graph = None  # ConflictGraph of the loaded courses file, once clashes are first shown
         self.requirements = []
 
         # --- Top Bar Frame (for Language and Feedback) ---
@@ -130,5 +132,6 @@ class App(tk.Tk):
 
 # This file is now the main entry point for the GUI
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
\ No newline at end of file
@@ -122,6 +122,7 @@ class Screen1(ttk.Frame):
             config_obj.update()
             all_courses = data_manager.parse_courses_from_excel(config_obj.input["courses"]["filepath"])
             self.controller.all_courses_list = all_courses
+            self.controller.conflict_graph = None  # Loaded when clashes are first shown for this file
             self.controller.on_courses_loaded()
         except Exception as e:
             messagebox.showerror(self.loc.get_string('error'), self.loc.get_string('file_load_error_msg', e=e))
\ No newline at end of file
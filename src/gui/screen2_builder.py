@@ -5,6 +5,7 @@ import json
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
+from src import data_manager
 from .predefined_reqs_data import PREDEFINED_REQS_KEYS
 
 class Screen2(ttk.Frame):
@@ -85,6 +86,8 @@ class Screen2(ttk.Frame):
         self.add_course_btn.pack(pady=2, padx=20)
         self.remove_course_btn = ttk.Button(add_remove_frame, command=self.remove_course_from_requirement)
         self.remove_course_btn.pack(pady=2, padx=20)
+        self.show_clashes_btn = ttk.Button(add_remove_frame, command=self.show_candidate_clashes)
+        self.show_clashes_btn.pack(pady=2, padx=20)
 
         self.candidate_courses_label = ttk.Label(editor_frame)
         self.candidate_courses_label.pack(fill="x", padx=5)
@@ -174,6 +177,7 @@ class Screen2(ttk.Frame):
         self.needed_label.config(text=loc.get_string('needed_label'))
         self.add_course_btn.config(text=loc.get_string('add_selected_btn'))
         self.remove_course_btn.config(text=loc.get_string('remove_selected_btn'))
+        self.show_clashes_btn.config(text=loc.get_string('show_clashes_btn'))
         self.candidate_courses_label.config(text=loc.get_string('candidate_courses_label'))
         self.req_list_frame_label.config(text=loc.get_string('program_reqs_label'))
         self.new_req_btn.config(text=loc.get_string('new_blank_req_btn'))
@@ -423,6 +427,36 @@ class Screen2(ttk.Frame):
         self.populate_editor_panel()
         self.update_requirement_from_editor()
 
+    def show_candidate_clashes(self):
+        """
+        Shows which candidates of the requirement being edited clash with candidates of any
+        requirement, using the conflict graph of the loaded courses file, which is loaded the
+        first time it is needed. Only the selected candidates are checked when some are selected.
+        """
+        if self.currently_editing_req_index is None or not self.controller.all_courses_list: return
+        if self.controller.conflict_graph is None:
+            self.controller.conflict_graph = data_manager.load_conflict_graph(self.controller.config,
+                                                                              self.controller.all_courses_list)
+        graph = self.controller.conflict_graph
+        req = self.controller.requirements[self.currently_editing_req_index]
+        selected_indices = self.editor_candidates_listbox.curselection()
+        if selected_indices:
+            codes = [self.editor_candidates_listbox.get(i) for i in selected_indices]
+        else:
+            codes = sorted(req.get('candidates', []))
+        all_candidates = {code for other in self.controller.requirements for code in other.get('candidates', [])}
+
+        lines = []
+        for code in codes:
+            if code not in graph: continue
+            clashing = [other for other in graph.clashes(code) if other in all_candidates]
+            if clashing: lines.append(f"{code}: {', '.join(clashing)}")
+        if lines:
+            message = self.loc.get_string('clashes_header') + "\n".join(lines)
+        else:
+            message = self.loc.get_string('no_clashes_msg')
+        messagebox.showinfo(self.loc.get_string('clashes_title'), message)
+
     def update_course_list(self, course_names):
         self.course_listbox.delete(0, tk.END)
         for course in sorted(course_names): self.course_listbox.insert(tk.END, course)
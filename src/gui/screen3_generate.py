@@ -18,8 +18,14 @@ SORT_OPTIONS = {
     "total_days": 'sort_by_total_days',
     "total_credits": 'sort_by_total_credits',
     "total_hours": 'sort_by_total_hours',
-    "total_courses": 'sort_by_total_courses'
+    "total_courses": 'sort_by_total_courses',
+    "idle_minutes": 'sort_by_idle_minutes',
+    "earliest_start": 'sort_by_earliest_start',
+    "latest_finish": 'sort_by_latest_finish',
+    "longest_day": 'sort_by_longest_day'
 }
+# Metrics the "Pareto-optimal only" option compares programs on, smaller being better
+PARETO_METRICS = ["total_days", "total_hours", "idle_minutes"]
 class Screen3(ttk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -28,6 +34,7 @@ class Screen3(ttk.Frame):
         self.generation_thread = None
         self.last_auto_save_path = None
         self.cancel_event = threading.Event()
+        self.stop_event = threading.Event()  # Set by "Stop and Show" to list what the search found so far
         self.tooltips = {}
 
         # --- NEW: Language-independent keys and maps ---
@@ -50,7 +57,11 @@ class Screen3(ttk.Frame):
         self.gen_vars = {
             "min_credit": tk.StringVar(value=self.controller.config.generation_params["min_credit"]),
             "max_credit": tk.StringVar(value=self.controller.config.generation_params["max_credit"]),
-            "load_if_possible": tk.BooleanVar(value=self.controller.config.input["cache"]["enabled"])
+            "load_if_possible": tk.BooleanVar(value=self.controller.config.input["cache"]["enabled"]),
+            "collapse_sections": tk.BooleanVar(
+                value=self.controller.config.generation_params["collapse_equivalent_sections"]),
+            "sample_size": tk.StringVar(value=self.controller.config.generation_params["sample_size"] or ""),
+            "time_budget": tk.StringVar(value=self.controller.config.generation_params["time_budget"] or "")
         }
         self.min_max_label = ttk.Label(self.gen_frame)
         self.min_max_label.grid(row=0, column=0, sticky="w", padx=5, pady=2)
@@ -60,6 +71,18 @@ class Screen3(ttk.Frame):
         self.credits_q_label.grid(row=0, column=3, sticky="w", padx=5)
         self.cache_check = ttk.Checkbutton(self.gen_frame, variable=self.gen_vars["load_if_possible"])
         self.cache_check.grid(row=1, column=0, columnspan=3, sticky="w", padx=5, pady=5)
+        self.collapse_check = ttk.Checkbutton(self.gen_frame, variable=self.gen_vars["collapse_sections"])
+        self.collapse_check.grid(row=2, column=0, columnspan=3, sticky="w", padx=5, pady=(0, 5))
+        self.sample_label = ttk.Label(self.gen_frame)
+        self.sample_label.grid(row=3, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(self.gen_frame, textvariable=self.gen_vars["sample_size"], width=5).grid(row=3, column=1, sticky="w", padx=5, pady=2)
+        self.sample_q_label = ttk.Label(self.gen_frame, text="(?)", cursor="question_arrow")
+        self.sample_q_label.grid(row=3, column=3, sticky="w", padx=5)
+        self.time_budget_label = ttk.Label(self.gen_frame)
+        self.time_budget_label.grid(row=4, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(self.gen_frame, textvariable=self.gen_vars["time_budget"], width=5).grid(row=4, column=1, sticky="w", padx=5, pady=2)
+        self.time_budget_q_label = ttk.Label(self.gen_frame, text="(?)", cursor="question_arrow")
+        self.time_budget_q_label.grid(row=4, column=3, sticky="w", padx=5)
 
         # Output Parameters Frame
         self.out_frame = ttk.LabelFrame(top_frame)
@@ -68,7 +91,8 @@ class Screen3(ttk.Frame):
             "limit": tk.StringVar(value=self.controller.config.display_params["limit_results"] or ""),
             # --- MODIFIED: Use a StringVar for the Combobox selection ---
             "sort_str": tk.StringVar(),
-            "sort_reverse": tk.BooleanVar(value=self.controller.config.display_params["sort_reverse"])
+            "sort_reverse": tk.BooleanVar(value=self.controller.config.display_params["sort_reverse"]),
+            "pareto": tk.BooleanVar(value=bool(self.controller.config.display_params["pareto_metrics"]))
         }
         self.limit_label = ttk.Label(self.out_frame)
         self.limit_label.grid(row=0, column=0, sticky="w", padx=5, pady=2)
@@ -86,6 +110,8 @@ class Screen3(ttk.Frame):
         self.sort_desc_check.grid(row=1, column=2, sticky="w")
         self.sort_q_label = ttk.Label(self.out_frame, text="(?)", cursor="question_arrow")
         self.sort_q_label.grid(row=1, column=3, sticky="w", padx=5)
+        self.pareto_check = ttk.Checkbutton(self.out_frame, variable=self.out_vars["pareto"])
+        self.pareto_check.grid(row=2, column=0, columnspan=4, sticky="w", padx=5, pady=2)
 
         # Filtering Frame
         self.filter_frame = ttk.LabelFrame(self)
@@ -136,10 +162,14 @@ class Screen3(ttk.Frame):
         bottom_frame.pack(fill="x", pady=10)
         self.back_btn = ttk.Button(bottom_frame, command=lambda: controller.show_screen2())
         self.back_btn.pack(side="left")
+        self.progress_label = ttk.Label(bottom_frame)
+        self.progress_label.pack(side="left", padx=10)
         button_container = ttk.Frame(bottom_frame)
         button_container.pack(side="right")
         self.generate_btn = ttk.Button(button_container, command=self.start_generation_thread)
         self.generate_btn.pack(side="right")
+        self.stop_btn = ttk.Button(button_container, command=self.stop_generation, state="disabled")
+        self.stop_btn.pack(side="right", padx=(0, 5))
         self.cancel_btn = ttk.Button(button_container, command=self.cancel_generation, state="disabled")
         self.cancel_btn.pack(side="right", padx=(0, 5))
         self.save_output_btn = ttk.Button(bottom_frame, command=self.save_output, state="disabled")
@@ -164,10 +194,14 @@ class Screen3(ttk.Frame):
         self.gen_frame.config(text=loc.get_string('gen_params_label'))
         self.min_max_label.config(text=loc.get_string('min_max_credits_label'))
         self.cache_check.config(text=loc.get_string('load_cached_label'))
+        self.collapse_check.config(text=loc.get_string('collapse_sections_label'))
+        self.sample_label.config(text=loc.get_string('sample_size_label'))
+        self.time_budget_label.config(text=loc.get_string('time_budget_label'))
         self.out_frame.config(text=loc.get_string('output_params_label'))
         self.limit_label.config(text=loc.get_string('limit_programs_label'))
         self.sort_label.config(text=loc.get_string('sort_by_label'))
         self.sort_desc_check.config(text=loc.get_string('descending_label'))
+        self.pareto_check.config(text=loc.get_string('pareto_label'))
         self.filter_frame.config(text=loc.get_string('filtering_label'))
         self.day_cond_label.config(text=loc.get_string('day_conds_label'))
         self.exclude_label.config(text=loc.get_string('exclude_courses_label'))
@@ -178,9 +212,11 @@ class Screen3(ttk.Frame):
         if self.generate_btn['state'] == 'disabled':
             self.generate_btn.config(text=self.loc.get_string('generating_btn'))
             self.cancel_btn.config(text=self.loc.get_string('cancelling_btn') if 'Cancelling' in self.cancel_btn['text'] else self.loc.get_string('cancel_btn'))
+            self.stop_btn.config(text=self.loc.get_string('stopping_btn') if self.stop_event.is_set() else self.loc.get_string('stop_show_btn'))
         else:
             self.generate_btn.config(text=self.loc.get_string('generate_btn'))
             self.cancel_btn.config(text=self.loc.get_string('cancel_btn'))
+            self.stop_btn.config(text=self.loc.get_string('stop_show_btn'))
 
         self.save_output_btn.config(text=loc.get_string('save_output_btn'))
         self.log_frame.config(text=loc.get_string('output_log_label'))
@@ -198,8 +234,12 @@ class Screen3(ttk.Frame):
         # --- Re-create Tooltips ---
         self.tooltips['credits'] = Tooltip(self.credits_q_label, loc.get_string('credits_tooltip'))
         self.tooltips['cache'] = Tooltip(self.cache_check, loc.get_string('cache_tooltip'))
+        self.tooltips['collapse'] = Tooltip(self.collapse_check, loc.get_string('collapse_sections_tooltip'))
+        self.tooltips['sample'] = Tooltip(self.sample_q_label, loc.get_string('sample_size_tooltip'))
+        self.tooltips['time_budget'] = Tooltip(self.time_budget_q_label, loc.get_string('time_budget_tooltip'))
         self.tooltips['limit'] = Tooltip(self.limit_q_label, loc.get_string('limit_tooltip'))
         self.tooltips['sort'] = Tooltip(self.sort_q_label, loc.get_string('sort_tooltip'))
+        self.tooltips['pareto'] = Tooltip(self.pareto_check, loc.get_string('pareto_tooltip'))
         self.tooltips['day_num'] = Tooltip(self.day_num_q_label, loc.get_string('day_num_tooltip'))
         self.tooltips['exclude'] = Tooltip(self.exclude_q_label, loc.get_string('exclude_tooltip'))
         self.tooltips['include'] = Tooltip(self.include_q_label, loc.get_string('include_tooltip'))
@@ -240,6 +280,13 @@ class Screen3(ttk.Frame):
         min_cred = int(min_cred_str) if min_cred_str else 30
         max_cred = int(max_cred_str) if max_cred_str else 42
         cache_filename = f"cache_{safe_courses_name}_reqs_{req_hash}_cr_{min_cred}-{max_cred}.pkl"
+        # Programs generated under search constraints only hold the filtered programs, so they get their own file
+        if config_obj.search_constraints:
+            filter_string = json.dumps(config_obj.search_constraints, sort_keys=True, separators=(',', ':'))
+            filter_hash = hashlib.sha256(filter_string.encode('utf-8')).hexdigest()[:8]
+            cache_filename = cache_filename.replace(".pkl", f"_f_{filter_hash}.pkl")
+        if config_obj.generation_params["collapse_equivalent_sections"]:
+            cache_filename = cache_filename.replace(".pkl", "_alt.pkl")
         return os.path.join(config_obj.paths["cache_dir"], cache_filename)
 
 
@@ -260,7 +307,9 @@ class Screen3(ttk.Frame):
 
     def start_generation_thread(self):
         self.cancel_event.clear()
+        self.stop_event.clear()
         self.generate_btn.config(state="disabled", text=self.loc.get_string('generating_btn'))
+        self.stop_btn.config(state="normal", text=self.loc.get_string('stop_show_btn'))
         self.cancel_btn.config(state="normal", text=self.loc.get_string('cancel_btn'))
         self.save_output_btn.config(state="disabled")
         self.controller.toggle_lang_buttons(enabled=False) # Disable lang switching
@@ -272,7 +321,7 @@ class Screen3(ttk.Frame):
         # --- MODIFIED: Pass the cancel_event to the worker thread ---
         self.generation_thread = threading.Thread(
             target=self.run_generation_worker,
-            args=(self.cancel_event,),  # Pass the event as an argument
+            args=(self.cancel_event, self.stop_event),  # Pass the events as arguments
             daemon=True
         )
         self.generation_thread.start()
@@ -282,19 +331,43 @@ class Screen3(ttk.Frame):
         print(f"\n--- {self.loc.get_string('gen_cancelled_log').strip()} ---")
         self.cancel_event.set()
         self.cancel_btn.config(state="disabled", text=self.loc.get_string('cancelling_btn'))
+        self.stop_btn.config(state="disabled")
+
+    def stop_generation(self):
+        """Ends the search early; the programs it has found so far are listed as a partial result."""
+        print(self.loc.get_string('gen_stopping_log'))
+        self.stop_event.set()
+        self.stop_btn.config(state="disabled", text=self.loc.get_string('stopping_btn'))
+
+    def show_progress(self, report):
+        """Shows a progress report of run_program_generation below the filters."""
+        values = {"nodes": f"{report['nodes']:,}", "rate": f"{report['nodes_per_second']:,.0f}",
+                  "estimated": f"{report['estimated_nodes']:,.0f}", "programs": f"{report['estimated_programs']:,.0f}"}
+        if report["seconds_left"] is None:
+            text = self.loc.get_string('progress_overdue_label', **values)
+        else:
+            minutes, seconds = divmod(int(report["seconds_left"]), 60)
+            hours, minutes = divmod(minutes, 60)
+            eta = f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+            text = self.loc.get_string('progress_label', eta=eta, **values)
+        self.progress_label.config(text=text)
 
     def check_queue(self):
         try:
             result = self.queue.get(block=False)
-            if isinstance(result, tuple) and len(result) == 3:
-                _, result_text, auto_save_path = result
+            # Progress reports arrive while the run goes on; show them and keep waiting for the result
+            while isinstance(result, dict):
+                self.show_progress(result)
+                result = self.queue.get(block=False)
+            if isinstance(result, tuple) and len(result) == 4:
+                _, result_text, auto_save_path, partial = result
 
                 # *** THIS IS THE FIX: PRINT THE RESULT TEXT ***
                 print(result_text)
 
                 is_error = "--- AN ERROR OCCURRED ---" in result_text or "--- BİR HATA OLUŞTU ---" in result_text
                 if not is_error:
-                    print(self.loc.get_string('gen_complete_log'))
+                    print(self.loc.get_string('gen_partial_log' if partial else 'gen_complete_log'))
                     self.last_auto_save_path = auto_save_path
                     self.save_output_btn.config(state="normal")
                 # print(result_text) # This is already handled by StdoutRedirector now
@@ -305,13 +378,15 @@ class Screen3(ttk.Frame):
             #     print(result) # Already handled
 
             # --- Reset UI state ---
+            self.progress_label.config(text="")
             self.generate_btn.config(state="normal", text=self.loc.get_string('generate_btn'))
             self.cancel_btn.config(state="disabled", text=self.loc.get_string('cancel_btn'))
+            self.stop_btn.config(state="disabled", text=self.loc.get_string('stop_show_btn'))
             self.controller.toggle_lang_buttons(enabled=True) # Re-enable lang switching
         except queue.Empty:
             self.after(100, self.check_queue)
 
-    def run_generation_worker(self, cancel_event):
+    def run_generation_worker(self, cancel_event, stop_event):
         try:
             config_obj = self.controller.config
             # ... set min/max credit
@@ -323,6 +398,7 @@ class Screen3(ttk.Frame):
             # ... set display params
             config_obj.display_params["limit_results"] = int(limit_str) if limit_str else None
             config_obj.display_params["sort_reverse"] = self.out_vars["sort_reverse"].get()
+            config_obj.display_params["pareto_metrics"] = PARETO_METRICS if self.out_vars["pareto"].get() else None
 
             selected_sort_text = self.out_vars["sort_str"].get()
             backend_sort_key = None
@@ -349,22 +425,28 @@ class Screen3(ttk.Frame):
             config_obj.display_params["filters"]["must_courses"] = parse_cs_string(self.filter_vars["must"].get())
 
             config_obj.input["cache"]["enabled"] = self.gen_vars["load_if_possible"].get()
+            config_obj.generation_params["collapse_equivalent_sections"] = self.gen_vars["collapse_sections"].get()
+            sample_str = self.gen_vars["sample_size"].get().strip()
+            config_obj.generation_params["sample_size"] = int(sample_str) if sample_str else None
+            time_budget_str = self.gen_vars["time_budget"].get().strip()
+            config_obj.generation_params["time_budget"] = float(time_budget_str) if time_budget_str else None
             self.controller.config.requirements = self.controller.requirements
             config_obj.update()
             cache_filepath = self._generate_cache_filename()
             config_obj.input["cache"]["filepath"] = cache_filepath
             print(self.loc.get_string('gen_config_updated_log'))
-            summarized_programs, results_output, auto_save_path = run_program_generation(config_obj, cancel_event)
+            summarized_programs, results_output, auto_save_path, partial = run_program_generation(
+                config_obj, cancel_event, progress_callback=self.queue.put, stop_event=stop_event)
 
             if cancel_event.is_set():
                 self.queue.put("CANCELLED")
             else:
-                self.queue.put((summarized_programs, results_output, auto_save_path))
+                self.queue.put((summarized_programs, results_output, auto_save_path, partial))
 
         except ValueError:
-            self.queue.put((None, self.loc.get_string('gen_value_error_log'), None))
+            self.queue.put((None, self.loc.get_string('gen_value_error_log'), None, False))
         except Exception as e:
-            self.queue.put((None, self.loc.get_string('gen_error_log', e=e), None))
+            self.queue.put((None, self.loc.get_string('gen_error_log', e=e), None, False))
 
     def _on_day_checkbox_click(self, event, var):
         """
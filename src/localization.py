@@ -35,6 +35,7 @@ class LocalizationManager:
                 'needed_label': "Needed:",
                 'add_selected_btn': "-> Add Selected",
                 'remove_selected_btn': "<- Remove Selected",
+                'show_clashes_btn': "Show Clashes",
                 'candidate_courses_label': "Candidate Courses:",
                 'program_reqs_label': "Program Requirements",
                 'new_blank_req_btn': "New Blank Requirement",
@@ -52,6 +53,9 @@ class LocalizationManager:
                 'req_add_course_warning': "Please create or select a requirement first.",
                 'req_select_courses_warning': "Please select one or more courses from 'Available Courses'.",
                 'req_remove_courses_warning': "Please select courses from 'Candidate Courses' to remove.",
+                'clashes_title': "Clashing Candidates",
+                'clashes_header': "Candidates of your requirements that meet at the same time:\n\n",
+                'no_clashes_msg': "These candidates do not clash with any candidate of your requirements.",
                 'reqs_saved_msg': "Requirements saved to {filename}",
                 'reqs_loaded_msg': "Loaded {count} requirements.",
                 'no_last_session_msg': "No last session file found to load.",
@@ -65,6 +69,7 @@ class LocalizationManager:
                 'gen_params_label': "Generation Parameters",
                 'min_max_credits_label': "Min/Max Credits:",
                 'load_cached_label': "Load cached programs if available",
+                'collapse_sections_label': "Merge same-time sections of a course",
                 'output_params_label': "Output Parameters",
                 'limit_programs_label': "Limit Programs:",
                 'sort_by_label': "Sort By:",
@@ -79,20 +84,33 @@ class LocalizationManager:
                 'save_output_btn': "Save Output As...",
                 'cancel_btn': "Cancel",
                 'cancelling_btn': "Cancelling...",
+                'stop_show_btn': "Stop and Show",
+                'stopping_btn': "Stopping...",
+                'progress_label': "{nodes} of ~{estimated} steps ({rate}/s), about {eta} left, ~{programs} programs expected",
+                'progress_overdue_label': "{nodes} steps ({rate}/s), past the estimate of ~{estimated}, ~{programs} programs expected",
                 'output_log_label': "Output Log",
                 'no_output_found_warning': "No auto-saved output file found. Please generate programs first.",
                 'output_copied_msg': "Output file copied to:\n{path}",
                 'gen_complete_log': "\n--- GENERATION COMPLETE ---",
                 'gen_cancelled_log': "\n--- GENERATION CANCELLED BY USER ---",
+                'gen_stopping_log': "\n--- STOPPING: LISTING THE PROGRAMS FOUND SO FAR ---",
+                'gen_partial_log': "\n--- GENERATION STOPPED EARLY: PARTIAL RESULT ---",
                 'gen_config_updated_log': "Configuration updated. Starting generation process...\n",
                 'gen_error_log': "\n--- AN ERROR OCCURRED ---\n{e}",
-                'gen_value_error_log': "\n--- AN ERROR OCCURRED ---\nError: Please ensure Min/Max Credits and Limit Programs are valid numbers.",
+                'gen_value_error_log': "\n--- AN ERROR OCCURRED ---\nError: Please ensure Min/Max Credits, Limit Programs, Random sample and Time limit are valid numbers\n(Random sample a whole number; leave the last two empty to turn them off).",
 
                 # Tooltips
                 'credits_tooltip': "Set the desired range for total ECTS credits in a program.\nLeave empty to use defaults (30-42).",
                 'limit_tooltip': "The maximum number of valid programs to display.\nLeave empty for NO LIMIT.",
                 'sort_tooltip': "How to sort the final list. Enter a key name.\nExample: total_days, total_credits, total_hours, total_courses",
                 'cache_tooltip': "If checked, the app will load pre-calculated programs if the\ncourse list, requirements, and credit limits haven't changed,\nsaving significant time. Uncheck to force a new calculation.",
+                'collapse_sections_tooltip': "If checked, sections of the same course with the same credits and\nmeeting times are treated as one. Each program is listed once, with\nthe other sections shown as alternatives. Generation is faster and\nthe output shorter.",
+                'sample_size_label': "Random sample:",
+                'time_budget_label': "Time limit (s):",
+                'time_budget_tooltip': "Leave empty to search until every program is found. Enter a number of seconds\nto stop the search then and list the best programs found so far (by the chosen\nsort order). Such a result is marked as partial and is not saved to the cache.",
+                'sample_size_tooltip': "Leave empty to generate every program. Enter a number to draw that many\nprograms uniformly at random instead, which is much faster when there are\nmillions. The filters apply, and the same settings draw the same sample.",
+                'pareto_label': "Pareto-optimal only (days, hours, idle time)",
+                'pareto_tooltip': "If checked, only programs that no other program beats on days, weekly hours\nand idle time between classes all at once are shown. Each remaining program\nis a different trade-off. The search skips programs that cannot qualify,\nso this is also much faster.",
                 'day_num_tooltip': "Filter by number of days (e.g., <=3)",
                 'day_cycle_tooltip': "Cycle states for {day}:\n  Empty: Don't care\n  Checked (✔): Must include\n  Crossed (✘): Must exclude",
                 'exclude_tooltip': "Programs with ANY of these courses will be removed. Comma-separated.\nExample: CS 447.A, ACC 201.A",
@@ -102,6 +120,7 @@ class LocalizationManager:
                 # Program Printer
                 'program_header': "\nProgram {index}:\n",
                 'courses_header': "Courses:",
+                'alternative_sections': " (or {codes})",
                 'total_credits_header': "Total Credits: {credits}\n",
                 'total_days_header': "Total Days: {days}\n",
                 'total_hours_header': "Total Hours: {hours:.2f}\n",
@@ -119,6 +138,10 @@ class LocalizationManager:
                 'sort_by_total_credits': "Total Credits",
                 'sort_by_total_hours': "Total Hours",
                 'sort_by_total_courses': "Total Courses",
+                'sort_by_idle_minutes': "Idle Time Between Classes",
+                'sort_by_earliest_start': "Earliest Start",
+                'sort_by_latest_finish': "Latest Finish",
+                'sort_by_longest_day': "Longest Day",
 
                 # --- NEW: Filter Descriptions ---
                 'filter_desc_total_days': "Total days {op} {val}",
@@ -296,6 +319,7 @@ class LocalizationManager:
                 'needed_label': "Gerekli Sayı:",
                 'add_selected_btn': "-> Seçileni Ekle",
                 'remove_selected_btn': "<- Seçileni Çıkar",
+                'show_clashes_btn': "Çakışmaları Göster",
                 'candidate_courses_label': "Aday Dersler:",
                 'program_reqs_label': "Program Gereksinimleri",
                 'new_blank_req_btn': "Yeni Boş Gereksinim",
@@ -313,6 +337,9 @@ class LocalizationManager:
                 'req_add_course_warning': "Lütfen önce bir gereksinim oluşturun veya seçin.",
                 'req_select_courses_warning': "'Mevcut Dersler' listesinden bir veya daha fazla ders seçin.",
                 'req_remove_courses_warning': "'Aday Dersler' listesinden çıkarılacak dersleri seçin.",
+                'clashes_title': "Çakışan Dersler",
+                'clashes_header': "Gereksinimlerinizdeki aynı saatte olan aday dersler:\n\n",
+                'no_clashes_msg': "Bu aday dersler, gereksinimlerinizdeki hiçbir aday dersle çakışmıyor.",
                 'reqs_saved_msg': "Gereksinimler şuraya kaydedildi: {filename}",
                 'reqs_loaded_msg': "{count} adet gereksinim yüklendi.",
                 'no_last_session_msg': "Yüklenecek son oturum dosyası bulunamadı.",
@@ -326,6 +353,7 @@ class LocalizationManager:
                 'gen_params_label': "Oluşturma Parametreleri",
                 'min_max_credits_label': "Min/Maks Kredi:",
                 'load_cached_label': "Varsa önbellekteki programları yükle",
+                'collapse_sections_label': "Aynı saatteki şubeleri birleştir",
                 'output_params_label': "Çıktı Parametreleri",
                 'limit_programs_label': "Program Limiti:",
                 'sort_by_label': "Sıralama Ölçütü:",
@@ -340,20 +368,33 @@ class LocalizationManager:
                 'save_output_btn': "Çıktıyı Farklı Kaydet...",
                 'cancel_btn': "İptal Et",
                 'cancelling_btn': "İptal Ediliyor...",
+                'stop_show_btn': "Durdur ve Göster",
+                'stopping_btn': "Durduruluyor...",
+                'progress_label': "{nodes} / ~{estimated} adım ({rate}/sn), yaklaşık {eta} kaldı, ~{programs} program bekleniyor",
+                'progress_overdue_label': "{nodes} adım ({rate}/sn), ~{estimated} tahmini aşıldı, ~{programs} program bekleniyor",
                 'output_log_label': "Çıktı Kayıtları",
                 'no_output_found_warning': "Otomatik kaydedilmiş çıktı dosyası bulunamadı. Lütfen önce program oluşturun.",
                 'output_copied_msg': "Çıktı dosyası şuraya kopyalandı:\n{path}",
                 'gen_complete_log': "\n--- OLUŞTURMA TAMAMLANDI ---",
                 'gen_cancelled_log': "\n--- OLUŞTURMA KULLANICI TARAFINDAN İPTAL EDİLDİ ---",
+                'gen_stopping_log': "\n--- DURDURULUYOR: ŞİMDİYE KADAR BULUNAN PROGRAMLAR LİSTELENİYOR ---",
+                'gen_partial_log': "\n--- OLUŞTURMA ERKEN DURDURULDU: KISMİ SONUÇ ---",
                 'gen_config_updated_log': "Yapılandırma güncellendi. Oluşturma süreci başlıyor...\n",
                 'gen_error_log': "\n--- BİR HATA OLUŞTU ---\n{e}",
-                'gen_value_error_log': "\n--- BİR HATA OLUŞTU ---\nLütfen Min/Maks Kredi ve Program Limiti alanlarına geçerli sayılar girin.",
+                'gen_value_error_log': "\n--- BİR HATA OLUŞTU ---\nLütfen Min/Maks Kredi, Program Limiti, Rastgele örnek ve Süre sınırı alanlarına geçerli sayılar girin\n(Rastgele örnek tam sayı olmalıdır; son ikisini kapatmak için boş bırakın).",
 
                 # Tooltips
                 'credits_tooltip': "Bir programdaki toplam AKTS kredisi için istenen aralığı ayarlayın.\nVarsayılanları (30-42) kullanmak için boş bırakın.",
                 'limit_tooltip': "Görüntülenecek maksimum geçerli program sayısı.\nSINIRSIZ için boş bırakın.",
                 'sort_tooltip': "Son listenin nasıl sıralanacağını belirtin. Bir anahtar kelime girin.\nÖrnek: total_days, total_credits, total_hours, total_courses",
                 'cache_tooltip': "İşaretlenirse, ders listesi, gereksinimler ve kredi limitleri değişmediyse,\nuygulama önceden hesaplanmış programları yükleyerek önemli ölçüde zaman kazandırır.",
+                'collapse_sections_tooltip': "İşaretlenirse, aynı kredi ve ders saatlerine sahip şubeler tek şube sayılır.\nHer program bir kez listelenir, diğer şubeler alternatif olarak gösterilir.\nÜretim daha hızlıdır ve çıktı daha kısadır.",
+                'sample_size_label': "Rastgele örnek:",
+                'time_budget_label': "Süre sınırı (sn):",
+                'time_budget_tooltip': "Tüm programlar bulunana kadar aramak için boş bırakın. Bir saniye değeri\ngirilirse arama o sürede durur ve şimdiye kadar bulunan en iyi programlar\n(seçilen sıralamaya göre) listelenir. Bu sonuç kısmi olarak işaretlenir ve\nönbelleğe kaydedilmez.",
+                'sample_size_tooltip': "Tüm programları üretmek için boş bırakın. Bir sayı girilirse o kadar program\ntekdüze rastgele seçilir; milyonlarca program olduğunda çok daha hızlıdır.\nFiltreler uygulanır ve aynı ayarlar aynı örneği seçer.",
+                'pareto_label': "Yalnızca Pareto-optimal (gün, saat, boş süre)",
+                'pareto_tooltip': "İşaretlenirse, yalnızca gün sayısı, haftalık saat ve dersler arası boş sürenin\nhepsinde birden başka bir programın geçemediği programlar gösterilir. Kalan her\nprogram farklı bir dengedir. Arama, uygun olamayacak programları atlar;\nbu nedenle çok daha hızlıdır.",
                 'day_num_tooltip': "Ders olan gün sayısına göre filtrele (örn: <=3)",
                 'day_cycle_tooltip': "{day} için durumlar arasında geçiş yap:\n  Boş: Fark etmez\n  İşaretli (✔): Mutlaka içermeli\n  Çapraz (✘): Mutlaka hariç tutulmalı",
                 'exclude_tooltip': "Bu derslerden HERHANGİ BİRİNİ içeren programlar kaldırılacaktır. Virgülle ayırın.\nÖrnek: CS 447.A, ACC 201.A",
@@ -363,6 +404,7 @@ class LocalizationManager:
                 # Program Printer
                 'program_header': "\nProgram {index}:\n",
                 'courses_header': "Dersler:",
+                'alternative_sections': " (veya {codes})",
                 'total_credits_header': "Toplam Kredi: {credits}\n",
                 'total_days_header': "Toplam Gün: {days}\n",
                 'total_hours_header': "Toplam Saat: {hours:.2f}\n",
@@ -380,6 +422,10 @@ class LocalizationManager:
                 'sort_by_total_credits': "Toplam Kredi",
                 'sort_by_total_hours': "Toplam Saat",
                 'sort_by_total_courses': "Toplam Ders",
+                'sort_by_idle_minutes': "Dersler Arası Boş Süre",
+                'sort_by_earliest_start': "En Erken Başlangıç",
+                'sort_by_latest_finish': "En Geç Bitiş",
+                'sort_by_longest_day': "En Uzun Gün",
 
                 # --- NEW: Filter Descriptions ---
                 'filter_desc_total_days': "Toplam gün {op} {val}",
@@ -1,12 +1,121 @@
 # src/main.py
 from src.program_printer import list_programs
-from src.data_manager import load_and_parse_courses, load_requirements_from_json, save_possible_programs, load_possible_programs
-from src.program_generator import generate_programs
+from src.data_manager import load_and_parse_courses, load_requirements_from_json, save_possible_programs, load_possible_programs, open_checkpoint, PROGRAM_CACHE_VERSION
+from src.program_generator import (count_programs, estimate_search, iter_programs, sample_programs, ParetoFront,
+                                   TopKPrograms)
+from src.program_set import ProgramSet
+from src.requirements_model import compile_requirements, RequirementError
 from src.config import Config
 import os
+import time
 
+# Rough memory per program a run keeps: its ProgramSet row and its part of the formatted report
+_BYTES_PER_PROGRAM = 1024
+# Estimated search nodes below which worker processes are not used. Starting them and sending them
+# the inputs takes a second or more, about what the sequential search needs for a few million nodes.
+_PARALLEL_MIN_NODES = 5_000_000
 
-def run_program_generation(config_obj, cancel_event=None):
+
+class _CountingStream:
+    """Wraps a program stream and counts the programs that pass through it."""
+
+    def __init__(self, programs):
+        self.programs = programs
+        self.count = 0
+
+    def __iter__(self):
+        for program in self.programs:
+            self.count += 1
+            yield program
+
+
+class _ProgressMeter:
+    """
+    Turns the node counts iter_programs reports into progress reports for a callback, at most
+    every `interval` seconds. Each report is a dict with 'nodes' (visited so far), 'nodes_per_second',
+    'seconds_left' (None once the estimate is exceeded) and the run's 'estimated_nodes' and
+    'estimated_programs'.
+    """
+
+    def __init__(self, callback, estimate, interval=0.5):
+        self.callback = callback
+        self.estimate = estimate
+        self.interval = interval
+        self.nodes = 0
+        self.start = self._last_report = time.monotonic()
+
+    def __call__(self, visited):
+        self.nodes += visited
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def report(self):
+        """Sends a report to the callback now."""
+        elapsed = time.monotonic() - self.start
+        rate = self.nodes / elapsed if elapsed > 0 else 0.0
+        seconds_left = None
+        if rate and self.nodes < self.estimate.nodes:
+            seconds_left = (self.estimate.nodes - self.nodes) / rate
+        self.callback({"nodes": self.nodes, "nodes_per_second": rate, "seconds_left": seconds_left,
+                       "estimated_nodes": self.estimate.nodes, "estimated_programs": self.estimate.programs})
+
+
+class _SearchStop:
+    """
+    Stands in for the cancel event of a search that may end early: it reads as set once the run
+    is cancelled, `stop_event` is set or `time_budget` seconds have passed. The search stops the
+    same way in every case; the caller tells a cancelled run from a partial one by its own
+    cancel event, and `stopped` records whether the search saw the signal before it finished.
+    """
+
+    def __init__(self, cancel_event, stop_event=None, time_budget=None):
+        self.cancel_event = cancel_event
+        self.stop_event = stop_event
+        self.deadline = None if time_budget is None else time.monotonic() + time_budget
+        self.stopped = False
+
+    def is_set(self):
+        if not self.stopped:
+            self.stopped = ((self.cancel_event is not None and self.cancel_event.is_set())
+                            or (self.stop_event is not None and self.stop_event.is_set())
+                            or (self.deadline is not None and time.monotonic() >= self.deadline))
+        return self.stopped
+
+
+def _open_checkpoint(config_obj, requirements, constraints):
+    """
+    Opens the checkpoint of a full generation run, unless checkpoints are disabled.
+
+    Returns:
+        tuple: (SearchCheckpoint or None, log line about resumed progress or "")
+    """
+    if config_obj.generation_params["checkpoint_interval"] is None:
+        return None, ""
+    checkpoint = open_checkpoint(config_obj, requirements, constraints)
+    if checkpoint.frontier is None:
+        return checkpoint, ""
+    return checkpoint, (f"Resuming an interrupted run: {len(checkpoint.programs)} programs were already found.\n")
+
+
+def _cancelled_message(checkpoint):
+    """The log text of a cancelled run, noting whether its progress was saved."""
+    if checkpoint is None:
+        return "Generation was cancelled."
+    return "Generation was cancelled. Its progress was saved; running it again with the same settings resumes it."
+
+
+def _partial_message(found, checkpoint):
+    """The log text of a search stopped before it finished, noting whether its progress was saved."""
+    message = (f"The search was stopped before it finished. Only the {found} programs found so far were "
+               f"considered, so this is a partial result.\n")
+    if checkpoint is not None:
+        message += "Its progress was saved; running it again with the same settings continues the search.\n"
+    return message
+
+
+def run_program_generation(config_obj, cancel_event=None, progress_callback=None, stop_event=None):
     """
     Main logic for generating and listing programs.
     This function is designed to be called from the GUI or other scripts.
@@ -14,19 +123,24 @@ def run_program_generation(config_obj, cancel_event=None):
     Args:
         config_obj (Config): A fully updated Config object.
         cancel_event (threading.Event, optional): Event to signal cancellation.
+        progress_callback (callable, optional): Receives progress report dicts while programs are
+            generated (see _ProgressMeter). Called from the generating thread.
+        stop_event (threading.Event, optional): Event to end the search early and list the best
+            programs found so far, like running out of generation_params["time_budget"].
 
     Returns:
-        tuple: (list of program dicts, log string, path of the auto-saved file)
+        tuple: (list of program dicts, log string, path of the auto-saved file, whether the search
+        was stopped early so the programs are only the best of those found so far)
 
     """
     requirements = load_requirements_from_json(config_obj.input["requirements"]["filepath"])
     if not requirements:
-        return [], "Error: Could not load requirements file.", None
+        return [], "Error: Could not load requirements file.", None, False
 
     # --- MODIFIED: Use the new caching function to get ALL courses first ---
     all_courses = load_and_parse_courses(config_obj)
     if not all_courses:
-        return [], "Error: Could not parse courses file.", None
+        return [], "Error: Could not parse courses file.", None, False
 
     # --- NEW: Filter the full course list based on requirements ---
     # This keeps the caching logic clean and moves the filtering to the correct place.
@@ -38,41 +152,179 @@ def run_program_generation(config_obj, cancel_event=None):
     # Create the final `courses` dictionary containing only the sections needed for this run
     courses = {code: course_obj for code, course_obj in all_courses.items() if code in candidate_courses}
 
+    # Validate the requirements and resolve their candidates once, before anything is generated
+    try:
+        plan = compile_requirements(requirements, courses)
+    except RequirementError as e:
+        return [], f"Error: Invalid requirements file. {e}", None, False
+
     # --- The rest of the function proceeds as before ---
     programs_file = config_obj.input["cache"]["filepath"]
     min_credit = config_obj.generation_params["min_credit"]
     max_credit = config_obj.generation_params["max_credit"]
+    constraints = config_obj.search_constraints
+    workers = config_obj.generation_params["workers"]
+    reorder = config_obj.generation_params["reorder_search"]
+    collapse = config_obj.generation_params["collapse_equivalent_sections"]
+    count_only = config_obj.generation_params["count_only"]
+    max_programs = config_obj.generation_params["max_programs"]
+    memory_budget_mb = config_obj.generation_params["memory_budget_mb"]
+    sample_size = config_obj.generation_params["sample_size"]
+    time_budget = config_obj.generation_params["time_budget"]
+    pareto_metrics = config_obj.display_params["pareto_metrics"]
     output_str = ""
+    if plan.unknown_codes:
+        output_str += (f"Skipped {len(plan.unknown_codes)} course codes not found in the courses file: "
+                       f"{', '.join(plan.unknown_codes)}\n")
     possible_programs = []
 
+    if count_only:
+        program_count = count_programs(plan, courses, min_credit, max_credit, cancel_event, constraints, reorder)
+        if program_count is None:
+            return [], "Generation was cancelled.", None, False
+        output_str += f"Counted {program_count} possible programs.\n"
+        return [], output_str, None, False
+
     # --- MODIFIED --- New, robust caching logic
     cache_hit = False
-    if config_obj.input["cache"]["enabled"] and programs_file and os.path.exists(programs_file):
+    partial = False
+    if sample_size:
+        # A sample is not the whole result set, so it neither comes from nor goes to the program cache
+        sample_seed = config_obj.generation_params["sample_seed"]
+        # Counting and drawing watch this, so the sample also ends at the time budget or stop_event
+        sample_stop = _SearchStop(cancel_event, stop_event, time_budget)
+        possible_programs = sample_programs(plan, courses, min_credit, max_credit, sample_size, sample_seed,
+                                            sample_stop, constraints, reorder)
+        if cancel_event and cancel_event.is_set():
+            return [], "Generation was cancelled.", None, False
+        output_str += f"Drew {len(possible_programs)} programs uniformly at random (seed {sample_seed}).\n"
+        if sample_stop.stopped and len(possible_programs) < sample_size:
+            partial = True
+            output_str += (f"Sampling was stopped before it finished, so fewer than the {sample_size} "
+                           f"programs asked for were drawn.\n")
+    elif config_obj.input["cache"]["enabled"] and programs_file and os.path.exists(programs_file):
         output_str += f"Potential cache file found: '{os.path.basename(programs_file)}'. Validating...\n"
         cached_data = load_possible_programs(programs_file)
 
         if cached_data and isinstance(cached_data, dict) and 'metadata' in cached_data:
             # Validate if the cached data was generated with the exact same parameters
             metadata = cached_data['metadata']
-            if metadata.get('requirements') == requirements and metadata.get('credits') == (min_credit, max_credit):
+            if (metadata.get('requirements') == requirements and metadata.get('credits') == (min_credit, max_credit)
+                    and metadata.get('constraints') == constraints and metadata.get('collapse_equivalent') == collapse
+                    and metadata.get('version') == PROGRAM_CACHE_VERSION):
                 output_str += "Cache is valid. Loading programs from cache.\n"
                 possible_programs = cached_data['programs']
                 cache_hit = True
             else:
-                output_str += "Cache is stale (requirements or credit limits differ). Regenerating programs.\n"
+                output_str += "Cache is stale (requirements, credit limits, filters or format differ). Regenerating programs.\n"
         else:
             output_str += "Cache file is invalid or old format. Regenerating programs.\n"
 
-    if not cache_hit:
+    program_stream = None
+    selection = None  # TopKPrograms or ParetoFront the streamed programs are offered to
+    checkpoint = None
+    generate = not (cache_hit or sample_size)
+    if generate and max_programs is not None:
+        # Counting is much cheaper than generating, so check first that the result stays manageable.
+        # The limit is on the programs the run lists, so with collapsed sections a program counts once.
+        program_count = count_programs(plan, courses, min_credit, max_credit, cancel_event, constraints, reorder,
+                                       collapse)
+        if program_count is None:
+            return [], "Generation was cancelled.", None, False
+        if program_count > max_programs:
+            output_str += (f"{program_count} programs match these requirements, more than the limit of "
+                           f"{max_programs}. Narrow the requirements or filters, or raise the limit.\n")
+            return [], output_str, None, False
+
+    progress = None
+    if generate and (progress_callback is not None or memory_budget_mb is not None or workers > 1):
+        # Only the progress display, the memory budget and the choice of workers read the estimate,
+        # so it is skipped otherwise
+        estimate = estimate_search(plan, courses, min_credit, max_credit, cancel_event, constraints, reorder, collapse)
+        if estimate is None:
+            return [], "Generation was cancelled.", None, False
+        output_str += (f"Estimated search size: about {estimate.nodes:,.0f} steps and "
+                       f"{estimate.programs:,.0f} programs.\n")
+        if workers > 1 and estimate.nodes < _PARALLEL_MIN_NODES:
+            workers = 1
+    if generate:
+        sort_key = config_obj.display_params["sort_key"]
+        limit_results = config_obj.display_params["limit_results"]
+        if pareto_metrics:
+            # Only the Pareto-optimal programs are shown, so the search can skip branches they beat
+            selection = ParetoFront(pareto_metrics)
+        elif sort_key and limit_results:
+            # Only the top programs are shown, so keep just those and let the search skip the rest
+            selection = TopKPrograms(limit_results, sort_key, config_obj.display_params["sort_reverse"])
+        if memory_budget_mb is not None and selection is None:
+            estimated_mb = estimate.programs * _BYTES_PER_PROGRAM / 2 ** 20
+            if estimated_mb > memory_budget_mb:
+                output_str += (f"The programs would need about {estimated_mb:,.0f} MB, more than the memory budget "
+                               f"of {memory_budget_mb} MB. Narrow the requirements or filters, limit and sort the "
+                               f"results, or raise the budget.\n")
+                return [], output_str, None, False
+        if progress_callback is not None:
+            progress = _ProgressMeter(progress_callback, estimate)
+            progress.report()
         output_str += "Generating possible programs... (This may take a while)\n"
-        possible_programs = generate_programs(requirements, courses, min_credit, max_credit, cancel_event)
-        if cancel_event and cancel_event.is_set():
-            return [], "Generation was cancelled.", None
+        # The search watches this instead of cancel_event, so it also ends at the time budget or stop_event
+        search_stop = _SearchStop(cancel_event, stop_event, time_budget)
+        if selection is None:
+            # A bounded search prunes against the programs kept so far, so only full runs are checkpointed
+            checkpoint, resume_message = _open_checkpoint(config_obj, requirements, constraints)
+            output_str += resume_message
+
+        programs = iter_programs(plan, courses, min_credit, max_credit, search_stop, constraints=constraints,
+                                 bound=selection, workers=workers, reorder=reorder, collapse_equivalent=collapse,
+                                 checkpoint=checkpoint, progress=progress)
+        if selection:
+            program_stream = _CountingStream(programs)
+            filter_function = config_obj.filter_function
+            for program in program_stream:
+                if filter_function is None or filter_function(program):
+                    selection.offer(program)
+            if cancel_event and cancel_event.is_set():
+                return [], "Generation was cancelled.", None, False
+            partial = search_stop.stopped
+            if partial:
+                output_str += _partial_message(program_stream.count, checkpoint)
+            elif config_obj.output["cache"]["enabled"]:
+                output_str += "Only the programs shown were kept, so the program cache was not updated.\n"
+            possible_programs = selection.results()
+        elif config_obj.output["cache"]["enabled"]:
+            # The program cache holds the complete set for these requirements and search constraints,
+            # so every program has to be collected here
+            possible_programs = ProgramSet(programs)
+            if cancel_event and cancel_event.is_set():
+                return [], _cancelled_message(checkpoint), None, False
+            if search_stop.stopped:
+                # Only a finished search fills the cache; the checkpoint keeps the rest for a later run
+                partial = True
+                output_str += _partial_message(len(possible_programs), checkpoint)
+            else:
+                if checkpoint:
+                    checkpoint.clear()
 
-        output_str += f"Found {len(possible_programs)} possible programs.\n"
-        if config_obj.output["cache"]["enabled"]:
-            output_str += f"Saving programs to cache file '{os.path.basename(programs_file)}'...\n"
-            save_possible_programs(possible_programs, programs_file, requirements, min_credit, max_credit)
+                output_str += f"Found {len(possible_programs)} possible programs.\n"
+                if possible_programs.alternative_ids:
+                    variants = sum(program.variant_count for program in possible_programs)
+                    output_str += f"With alternative sections expanded: {variants} programs.\n"
+                output_str += f"Saving programs to cache file '{os.path.basename(programs_file)}'...\n"
+                save_possible_programs(possible_programs, programs_file, requirements, min_credit, max_credit,
+                                       constraints, collapse)
+        else:
+            # Without a cache to fill, programs stream straight into filtering and sorting
+            program_stream = possible_programs = _CountingStream(programs)
+
+    if pareto_metrics and selection is None:
+        # Cached or sampled programs are all at hand; keep the Pareto-optimal ones among those passing the filters
+        front = ParetoFront(pareto_metrics)
+        filter_function = config_obj.filter_function
+        for program in possible_programs:
+            if filter_function is None or filter_function(program):
+                front.offer(program)
+        possible_programs = front.results()
+        output_str += f"Kept {len(possible_programs)} Pareto-optimal programs by {', '.join(pareto_metrics)}.\n"
 
     # --- CHANGED --- Pass the new structured parameters
     summarized_programs, formatted_output = list_programs(
@@ -92,18 +344,35 @@ def run_program_generation(config_obj, cancel_event=None):
         cancel_event=cancel_event
     )
 
+    if isinstance(selection, ParetoFront):
+        output_str += (f"Kept {len(possible_programs)} Pareto-optimal programs by {', '.join(pareto_metrics)} "
+                       f"({program_stream.count} programs examined).\n")
+    elif selection is not None:
+        output_str += (f"Kept the top {limit_results} programs by '{sort_key}' "
+                       f"({program_stream.count} programs examined).\n")
+    elif program_stream is not None:
+        if cancel_event and cancel_event.is_set():
+            return [], _cancelled_message(checkpoint), None, False
+        partial = search_stop.stopped
+        if partial:
+            output_str += _partial_message(program_stream.count, checkpoint)
+        else:
+            if checkpoint:
+                checkpoint.clear()
+            output_str += f"Found {program_stream.count} possible programs.\n"
+
     auto_save_path = config_obj.output["report"]["filepath"]
 
     if auto_save_path:
         output_str += f"\nFormatted output also saved to file: {auto_save_path}\n"
     output_str += f"\n--- PROGRAMS ---\n{formatted_output}"
 
-    return summarized_programs, output_str, auto_save_path
+    return summarized_programs, output_str, auto_save_path, partial
 
 if __name__ == '__main__':
     print("Running main.py as a script with default config...")
     # Create an instance and update it for standalone runs
     default_config = Config()
     default_config.update()
-    _, results_text, _ = run_program_generation(default_config)
+    _, results_text, _, _ = run_program_generation(default_config)
     print(results_text)
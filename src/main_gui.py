@@ -1,4 +1,5 @@
 from src.gui.main_app import App
+import multiprocessing
 import sys
 import os
 
@@ -7,5 +8,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 if __name__ == "__main__":
+    # Generation workers are separate processes; frozen builds need this before anything else runs
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
\ No newline at end of file
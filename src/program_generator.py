@@ -1,51 +1,12 @@
+import concurrent.futures
+import heapq
+import multiprocessing
 import operator
+import random
 
-
-def check_satisfied(needed, count):
-    # Define a dictionary to map operators to their corresponding functions
-    condition_operators = {
-        "=" : operator.eq,
-        "<=": operator.le,
-        ">=": operator.ge,
-        "<" : operator.lt,
-        ">" : operator.gt
-    }
-
-    # Extract the operator and value
-    for op in condition_operators.keys():
-        if needed.startswith(op):
-            value = int(
-                needed[len(op):])  # Extract the number after the operator
-            condition_func = condition_operators[op]
-            return condition_func(count, value)
-    raise ValueError(f"Invalid condition: {needed}")
-
-
-# Helper function to convert a time string to a datetime object (for comparison)
-def time_to_minutes(time_str) -> int:
-    """Convert time in 'HH.MM' format to total minutes"""
-    hours, minutes = map(int, time_str.split("."))
-    return hours * 60 + minutes
-
-
-# Helper function to convert a time string to a datetime object (for comparison)
-def minutes_to_time(minutes_int) -> str:
-    hours, minutes = divmod(minutes_int, 60)
-    hours = str(hours)
-    minutes = str(minutes)
-    if len(hours) == 1:
-        hours = "0" + hours
-    if len(minutes) == 1:
-        minutes = "0" + minutes
-    return hours + '.' + minutes
-
-
-# Helper function to parse the schedule string
-def parse_time_slot(time_slot_str):
-    """Parse a schedule string and return a list of (day, start_time, end_time) tuples"""
-    day = time_slot_str["day"]
-    start_time, end_time = time_slot_str["interval"].split("-")
-    return day, time_to_minutes(start_time), time_to_minutes(end_time)
+from src.program_set import Program, ProgramSet
+from src.requirements_model import RequirementPlan, compile_requirements
+from src.time_masks import parse_time_slot, day_index, days_to_time_mask, latest_finish, longest_day
 
 
 # Helper function to check if two time slots overlap
@@ -60,141 +21,1467 @@ def check_program_course_conflict(current_program_param, candidate_schedule_para
     return False  # No conflict
 
 
-def calculate_program_stats(program, courses):
-    """Calculates total days, total hours, and total courses for a program."""
-    days = set()
-    total_minutes = 0
+class LegacyConflictBackend:
+    """Compares schedule strings slot by slot. Kept as a reference for the bitmask backend."""
+
+    name = "legacy"
+
+    def empty(self):
+        """Returns the occupied state of an empty program."""
+        return ()
+
+    def add(self, occupied, table, section_id):
+        """Returns the occupied state after adding a section of the course table."""
+        return occupied + tuple(table.schedules[section_id])
+
+    def conflicts(self, occupied, table, section_id):
+        """Checks whether a section of the course table overlaps the occupied state."""
+        return check_program_course_conflict({"schedule": occupied}, table.schedules[section_id])
+
+
+class BitmaskConflictBackend:
+    """Tests conflicts with one AND against the accumulated weekly occupancy mask."""
+
+    name = "bitmask"
+
+    def empty(self):
+        """Returns the occupied state of an empty program."""
+        return 0
+
+    def add(self, occupied, table, section_id):
+        """Returns the occupied state after adding a section of the course table."""
+        return occupied | table.time_masks[section_id]
+
+    def conflicts(self, occupied, table, section_id):
+        """Checks whether a section of the course table overlaps the occupied state."""
+        return (occupied & table.time_masks[section_id]) != 0
+
+
+class GraphConflictBackend:
+    """
+    Tests conflicts against the precomputed conflict graph of the course table: the occupied
+    state is the bitset of chosen section IDs, and one AND with the candidate's conflicts-with
+    set decides.
+    """
+
+    name = "graph"
+
+    def empty(self):
+        """Returns the occupied state of an empty program."""
+        return 0
+
+    def add(self, occupied, table, section_id):
+        """Returns the occupied state after adding a section of the course table."""
+        return occupied | (1 << section_id)
+
+    def conflicts(self, occupied, table, section_id):
+        """Checks whether a section of the course table clashes with a chosen one."""
+        return (occupied & table.conflict_masks[section_id]) != 0
+
+
+# Conflict backends selectable by name in generate_programs
+CONFLICT_BACKENDS = {
+    "bitmask": BitmaskConflictBackend(),
+    "graph": GraphConflictBackend(),
+    "legacy": LegacyConflictBackend(),
+}
+
+
+def _credit_limited_max_courses(credits, max_credit):
+    """Returns how many of the given courses fit under max_credit at most (cheapest first)."""
+    total = 0
+    for count, credit in enumerate(sorted(credits)):
+        total += credit
+        if total > max_credit:
+            return count
+    return len(credits)
+
+
+class _CreditBounds:
+    """
+    Upper bounds on the credits still reachable from any point of the search, used to cut
+    branches that can no longer reach the minimum credit load.
+
+    best[i][j][r] is the most credits obtainable by taking at most r of the candidates
+    j, j+1, ... of requirement i. suffix[i] is the most credits obtainable from requirements
+    i, i+1, ... taken as a whole.
+    """
+
+    def __init__(self, candidate_ids, table, count_bounds):
+        self.best = []
+        for ids, (_, max_courses) in zip(candidate_ids, count_bounds):
+            credits = [table.credits[section_id] for section_id in ids]
+            self.best.append(self._best_credit_table(credits, max_courses))
+
+        self.suffix = [0] * (len(candidate_ids) + 1)
+        for i in range(len(candidate_ids) - 1, -1, -1):
+            self.suffix[i] = self.suffix[i + 1] + self.best[i][0][-1]
+
+    @staticmethod
+    def _best_credit_table(credits, max_courses):
+        # table[j][r] = max(table[j + 1][r], credits[j] + table[j + 1][r - 1])
+        max_courses = max(max_courses, 0)  # An unsatisfiable condition like "<0" still gets a column
+        table = [[0] * (max_courses + 1) for _ in range(len(credits) + 1)]
+        for j in range(len(credits) - 1, -1, -1):
+            below = table[j + 1]
+            row = table[j]
+            for r in range(1, max_courses + 1):
+                row[r] = max(below[r], credits[j] + below[r - 1])
+        return table
+
+
+# Operators accepted in a day count condition (see Config._build_search_constraints)
+_DAY_CONDITION_OPERATORS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "=" : operator.eq,
+    "==": operator.eq,
+    "<" : operator.lt,
+    ">" : operator.gt,
+    "!=": operator.ne,
+}
+
+
+class _CompiledConstraints:
+    """
+    Search constraints built by Config._build_search_constraints, in the form the search uses:
+    candidate lists without the sections no accepted program can contain, a day limit checked
+    on descent, the must-course IDs to force, and a leaf check for whatever cannot be pruned early.
+    """
+
+    def __init__(self, constraints, plan):
+        table = plan.table
+        exclude = set(constraints.get("exclude_courses") or ())
+        self.include = set(constraints.get("include_courses") or ())
+        self.must = set(constraints.get("must_courses") or ())
+        self.required_day_mask = 0
+        for day in constraints.get("required_days") or ():
+            self.required_day_mask |= 1 << day_index(day)
+        forbidden_time_mask = days_to_time_mask(constraints.get("forbidden_days") or ())
+
+        self.day_condition = None
+        self.max_days = float('inf')
+        if constraints.get("day_num_condition"):
+            op_str, value = constraints["day_num_condition"]
+            self.day_condition = (_DAY_CONDITION_OPERATORS[op_str], value)
+            if op_str in ("<=", "=", "=="):
+                self.max_days = value
+            elif op_str == "<":
+                self.max_days = value - 1
+
+        # Every accepted program holds all must-courses, so anything clashing with one is useless
+        self.include_ids = {table.ids[code] for code in self.include if code in table.ids}
+        self.must_ids = {table.ids[code] for code in self.must if code in table.ids}
+        exclude_ids = {table.ids[code] for code in exclude if code in table.ids}
+        must_time_masks = [table.time_masks[section_id] for section_id in self.must_ids]
+        must_groups = {table.group_ids[section_id] for section_id in self.must_ids}
+
+        def allowed(section_id):
+            time_mask = table.time_masks[section_id]
+            if section_id in exclude_ids or time_mask & forbidden_time_mask:
+                return False
+            if section_id in self.must_ids:
+                return True
+            # Must-courses are always taken, so their siblings and anything clashing with them never are
+            return (table.group_ids[section_id] not in must_groups
+                    and not any(time_mask & mask for mask in must_time_masks))
+
+        self.plan = plan.restricted(allowed)
+        listed = {section_id for req in self.plan for section_id in req.candidate_ids}
+        self.impossible = not self.must_ids.issubset(listed) or len(self.must_ids) < len(self.must)
+
+    def must_deadlines(self, plan):
+        """
+        Returns, for each requirement of the plan the search runs on, the must-course IDs it
+        lists first. The search decides every section at the first requirement listing it, so
+        a must-course has to be taken there.
+        """
+        deadlines = [set() for _ in plan]
+        seen = set()
+        for i, req in enumerate(plan):
+            for section_id in req.candidate_ids:
+                if section_id in self.must_ids and section_id not in seen:
+                    deadlines[i].add(section_id)
+            seen.update(req.candidate_ids)
+        return deadlines
+
+    def accepts(self, section_ids, day_mask):
+        """Checks the constraints that can only be decided on a complete program."""
+        if self.include and self.include_ids.isdisjoint(section_ids):
+            return False
+        if not self.must_ids.issubset(section_ids):
+            return False
+        if self.required_day_mask & ~day_mask:
+            return False
+        if self.day_condition:
+            op_func, value = self.day_condition
+            if not op_func(day_mask.bit_count(), value):
+                return False
+        return True
+
+
+def _collapse_equivalent_sections(plan, constraints=None):
+    """
+    Keeps one representative of each set of interchangeable sections: sections of the same
+    course with the same credits and meeting times, listed by the same requirements and
+    treated alike by the constraints. Sections of one course are never taken together, so
+    swapping the others in for the representative gives back exactly the full result set.
+
+    Args:
+        plan (RequirementPlan): The plan the search runs on.
+        constraints (_CompiledConstraints, optional): The compiled search constraints.
+
+    Returns:
+        tuple: The plan without the non-representative sections, and a dict mapping each
+        representative that has equivalents to the tuple of their IDs.
+    """
+    table = plan.table
+    listings = {}
+    for i, req in enumerate(plan):
+        for section_id in req.candidate_ids:
+            listings.setdefault(section_id, []).append(i)
+
+    classes = {}
+    for section_id, requirement_indices in listings.items():
+        schedule_key = tuple(sorted((slot["day"], slot["interval"]) for slot in table.schedules[section_id]))
+        key = (table.group_ids[section_id], table.credits[section_id], schedule_key, tuple(requirement_indices))
+        if constraints is not None:
+            key += (section_id in constraints.include_ids, section_id in constraints.must_ids)
+        classes.setdefault(key, []).append(section_id)
+
+    alternative_ids = {members[0]: tuple(members[1:]) for members in classes.values() if len(members) > 1}
+    if not alternative_ids:
+        return plan, None
+    dropped = {section_id for others in alternative_ids.values() for section_id in others}
+    return plan.restricted(lambda section_id: section_id not in dropped), alternative_ids
+
+
+class _SearchState:
+    """
+    The program currently being built. It is updated in place when the search descends
+    and restored when it backtracks, so each node does constant work.
+    """
+
+    __slots__ = ("backend", "table", "occupied", "days", "time_mask", "undo_stack", "credits", "minutes",
+                 "req_counts", "chosen", "selected", "groups")
+
+    def __init__(self, backend, table, requirement_count):
+        self.backend = backend
+        self.table = table
+        self.occupied = backend.empty()  # Occupied time state in the backend's own representation
+        self.days = 0  # Day mask of the chosen sections
+        self.time_mask = 0  # Weekly occupancy mask of the chosen sections, for the day-span metrics
+        self.undo_stack = []  # Previous (occupied, days, time_mask) triples, restored on pop
+        self.credits = 0  # Running ECTS total of the chosen sections
+        self.minutes = 0  # Running weekly minutes of the chosen sections
+        self.req_counts = [0] * requirement_count  # Sections taken at each requirement
+        self.chosen = []  # Chosen section IDs, in the order they were taken
+        self.selected = 0  # Bitset of the chosen section IDs (bit i is section i)
+        self.groups = 0  # Bitset of the courses (CourseTable group IDs) a section has been chosen from
+
+    def push(self, section_id, requirement_index):
+        """Adds a section taken for the given requirement."""
+        table = self.table
+        self.undo_stack.append((self.occupied, self.days, self.time_mask))
+        self.occupied = self.backend.add(self.occupied, table, section_id)
+        self.days |= table.day_masks[section_id]
+        self.time_mask |= table.time_masks[section_id]
+        self.credits += table.credits[section_id]
+        self.minutes += table.minutes[section_id]
+        self.req_counts[requirement_index] += 1
+        self.chosen.append(section_id)
+        self.selected |= 1 << section_id
+        self.groups |= 1 << table.group_ids[section_id]
+
+    def pop(self, requirement_index):
+        """Removes the most recently pushed section."""
+        section_id = self.chosen.pop()
+        self.selected &= ~(1 << section_id)
+        self.groups &= ~(1 << self.table.group_ids[section_id])
+        self.occupied, self.days, self.time_mask = self.undo_stack.pop()
+        self.credits -= self.table.credits[section_id]
+        self.minutes -= self.table.minutes[section_id]
+        self.req_counts[requirement_index] -= 1
+
 
-    for course_code in program['courses']:
-        for schedule_entry in courses[course_code].schedule:
-            days.add(schedule_entry['day'])
-            start_minutes = time_to_minutes(schedule_entry['interval'].split('-')[0])
-            end_minutes = time_to_minutes(schedule_entry['interval'].split('-')[1])
-            total_minutes += (end_minutes - start_minutes)
+# Lower bounds of a sort key for every program that extends the partial one in a search state.
+# Only keys that never decrease as courses are added can be used to cut branches.
+_PARTIAL_SORT_VALUES = {
+    "total_days": lambda state: state.days.bit_count(),
+    "total_credits": lambda state: state.credits,
+    "total_hours": lambda state: state.minutes / 60.0,
+    "total_courses": lambda state: len(state.chosen),
+    "latest_finish": lambda state: latest_finish(state.time_mask),
+    "longest_day": lambda state: longest_day(state.time_mask),
+}
 
-    program["total_days"] = len(days)
-    program["total_hours"] = total_minutes / 60.0  # Convert minutes to hours
-    program["total_courses"] = len(program['courses'])
-    return program
 
+class TopKPrograms:
+    """
+    Keeps the best `limit` programs of a stream in a bounded heap. The kept programs, in
+    order, are the same as sorted(programs, key=itemgetter(sort_key), reverse=reverse)[:limit],
+    ties included.
+
+    Passed to iter_programs as `bound`, it also cuts every branch whose programs could not
+    beat the worst program kept so far (ascending sorts on the keys in _PARTIAL_SORT_VALUES).
+    """
 
-def is_program_valid(program, requirements, courses, min_credit, max_credit):
-    total_credits = sum(int(courses[course_code].ects_credits) for course_code in program['courses'])
-    if not (min_credit <= total_credits <= max_credit):
-        return False
+    def __init__(self, limit, sort_key, reverse=False):
+        self.limit = limit
+        self.sort_key = sort_key
+        self.reverse = reverse
+        self._partial_value = None if reverse else _PARTIAL_SORT_VALUES.get(sort_key)
+        # Entries are (rank, -arrival, program); heap[0] is the worst kept program.
+        # Among equal keys the later arrival ranks lower, which keeps the order stable.
+        self._heap = []
+        self._arrivals = 0
 
-    for req in requirements:
-        count = 0
-        for course_code in program['courses']:
-            if course_code in req['candidates']:
-                count += 1
-        if not check_satisfied(req['needed'], count):
+    def offer(self, program):
+        """Considers a program for the kept set."""
+        value = program[self.sort_key]
+        entry = (value if self.reverse else -value, -self._arrivals, program)
+        self._arrivals += 1
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def prunes(self, state):
+        """Checks whether no program extending the search state can make it into the kept set."""
+        if self._partial_value is None or len(self._heap) < self.limit:
             return False
+        return self._partial_value(state) >= -self._heap[0][0]
+
+    def results(self):
+        """Returns the kept programs, best first."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
 
-    program["total_credits"] = total_credits
-    program = calculate_program_stats(program, courses)  # Calculate total_days and total_hours
-    return True
 
+# Pareto metrics whose lower bound over the programs extending a partial one never rises above a
+# fixed value. A class can fill any gap, so idle time is only bounded by zero. Other metrics are
+# bounded by _PARTIAL_SORT_VALUES.
+_FIXED_LOWER_BOUNDS = {"idle_minutes": 0}
 
-def _generate_programs(requirement_index, current_program_courses, requirements, courses, min_credit, max_credit,
-                       possible_programs, cancel_event):
+
+def _dominates(values, other):
+    """Whether metric values are at least as good as `other` everywhere and better somewhere (smaller is better)."""
+    return values != other and all(value <= other_value for value, other_value in zip(values, other))
+
+
+class ParetoFront:
+    """
+    Keeps the Pareto-optimal programs of a stream: those that no other program matches or beats
+    on every metric while beating them on one, with smaller values better on each metric.
+    Programs with the same metric values are all kept.
+
+    Passed to iter_programs as `bound`, it also cuts every branch whose programs would all be
+    beaten by a kept program, judged by the lower bounds in _PARTIAL_SORT_VALUES and
+    _FIXED_LOWER_BOUNDS. With a metric that has neither, nothing is cut.
+    """
+
+    def __init__(self, metrics):
+        """
+        Args:
+            metrics (list): Program keys to compare on, such as "total_days", "total_hours" and "idle_minutes".
+        """
+        self.metrics = tuple(metrics)
+        self._lower_bounds = None
+        if all(metric in _PARTIAL_SORT_VALUES or metric in _FIXED_LOWER_BOUNDS for metric in self.metrics):
+            # (bound function, None) or (None, fixed bound) per metric
+            self._lower_bounds = [(_PARTIAL_SORT_VALUES.get(metric), _FIXED_LOWER_BOUNDS.get(metric))
+                                  for metric in self.metrics]
+        self._front = {}  # Metric values -> the kept programs with them, in arrival order
+        self._pruners = []  # Kept metric values that can beat a lower bound: at most the fixed bounds
+        self._last_dominator = None  # Kept metric values that beat the previous rejected program
+
+    def offer(self, program):
+        """Considers a program for the front, dropping the kept programs it beats."""
+        values = tuple(program[metric] for metric in self.metrics)
+        same = self._front.get(values)
+        if same is not None:
+            same.append(program)
+            return
+        # Consecutive programs tend to be beaten by the same kept one, so try it first
+        if self._last_dominator is not None and _dominates(self._last_dominator, values):
+            return
+        for kept_values in self._front:
+            if _dominates(kept_values, values):
+                self._last_dominator = kept_values
+                return
+        for kept_values in [kept_values for kept_values in self._front if _dominates(values, kept_values)]:
+            del self._front[kept_values]
+            if kept_values == self._last_dominator:
+                self._last_dominator = None
+        self._front[values] = [program]
+        if self._lower_bounds is not None:
+            self._pruners = [kept_values for kept_values in self._front
+                             if all(fixed is None or value <= fixed
+                                    for value, (_, fixed) in zip(kept_values, self._lower_bounds))]
+
+    def prunes(self, state):
+        """Checks whether a kept program beats every program extending the search state."""
+        if not self._pruners:
+            return False
+        bounds = tuple(fixed if lower_bound is None else lower_bound(state) for lower_bound, fixed in self._lower_bounds)
+        return any(_dominates(kept_values, bounds) for kept_values in self._pruners)
+
+    def results(self):
+        """Returns the kept programs, ordered by their metric values."""
+        return [program for values in sorted(self._front) for program in self._front[values]]
+
+
+class _SearchContext:
+    """Everything about a generation run that stays fixed while the search runs."""
+
+    def __init__(self, plan, min_credit, max_credit, cancel_event, constraints=None, bound=None, split_depth=None,
+                 reorder=True, collapse=False, progress=None):
+        self.bound = bound
+        self.progress = progress  # Called with the number of nodes visited since its previous call
+        self.split_depth = split_depth  # When set, the search yields prefixes at this requirement instead of programs
+        self.table = plan.table
+        self.constraints = None
+        if constraints:
+            self.constraints = _CompiledConstraints(constraints, plan)
+            plan = self.constraints.plan
+        self.alternative_ids = None
+        if collapse and self.table.has_siblings:
+            plan, self.alternative_ids = _collapse_equivalent_sections(plan, self.constraints)
+        if reorder:
+            plan = plan.ordered()
+        self.plan = plan
+        self.must_deadlines = self.constraints.must_deadlines(plan) if self.constraints else None
+
+        self.requirements = plan.requirements
+        self.min_credit = min_credit
+        self.max_credit = max_credit
+        self.cancel_event = cancel_event
+
+        # Every section is decided once, at the first requirement listing it, so each course set is
+        # reached by one path only. Later requirements listing it just count it: decided_masks[i]
+        # holds the sections requirement i lists that earlier requirements decide.
+        self.candidate_ids = []
+        self.decided_masks = []
+        decided = 0
+        for req in plan:
+            self.candidate_ids.append(tuple(section_id for section_id in req.candidate_ids
+                                            if not decided >> section_id & 1))
+            self.decided_masks.append(req.mask & decided)
+            decided |= req.mask
+
+        # Where each section goes when a program's courses are listed in the user's order: by the
+        # original index of the requirement deciding it, then by its position there. None when the
+        # search already takes sections in that order.
+        self.section_rank = None
+        if plan.order != tuple(sorted(plan.order)) or any(req.positions != tuple(sorted(req.positions))
+                                                          for req in plan):
+            width = 1 + max((position for req in plan for position in req.positions), default=0)
+            self.section_rank = [0] * len(self.table)
+            for req, original_index, owned in zip(plan, plan.order, self.candidate_ids):
+                for section_id, position in zip(req.candidate_ids, req.positions):
+                    if section_id in owned:
+                        self.section_rank[section_id] = original_index * width + position
+
+        # (min, max) courses per requirement. Open-ended maxima are capped by how many
+        # candidates exist and how many of them fit under max_credit.
+        self.count_bounds = []
+        for req in plan:
+            credits = [self.table.credits[section_id] for section_id in req.candidate_ids]
+            max_courses = min(req.max_count, _credit_limited_max_courses(credits, max_credit))
+            self.count_bounds.append((req.min_count, max_courses))
+
+        self.credit_bounds = _CreditBounds(self.candidate_ids, self.table, self.count_bounds)
+
+
+def _build_program(state, ctx):
+    """
+    Returns the program of a finished search state, or None when it fails the credit limits
+    or a leaf constraint. Requirement counts are already final and checked by the search.
+    """
+    if not ctx.min_credit <= state.credits <= ctx.max_credit:
+        return None
+    chosen = state.chosen
+    if ctx.constraints is not None and not ctx.constraints.accepts(chosen, state.days):
+        return None
+    if ctx.section_rank is not None:
+        chosen = sorted(chosen, key=ctx.section_rank.__getitem__)
+    return Program(ctx.table, tuple(chosen), state.credits, state.days, state.minutes, ctx.alternative_ids,
+                   state.time_mask)
+
+
+def _iter_programs(requirement_index, state, ctx):
+    cancel_event = ctx.cancel_event
     # At the start of each major step, check if cancellation has been requested.
     if cancel_event and cancel_event.is_set():
         return # Exit the recursion immediately
 
+    requirements = ctx.requirements
+    table = ctx.table
+    if requirement_index == ctx.split_depth:
+        # Hand the partial program over as an independent subproblem
+        yield state.chosen.copy(), state.req_counts[:requirement_index]
+        return
     if requirement_index == len(requirements):
-        program = {
-            "courses" : current_program_courses,
-            "schedule": []
-        }
-        for course_code in current_program_courses:
-            program["schedule"].extend(courses[course_code].schedule)
-
-        if is_program_valid(program, requirements, courses, min_credit, max_credit):
-            # print(f"Found valid program: {program}")
-            possible_programs.append(program)
+        program = _build_program(state, ctx)
+        if program is not None:
+            yield program
         return
 
     # Option 1: Try to fulfill the requirement with candidates
     current_requirement = requirements[requirement_index]
-    course_options = current_requirement["candidates"]
-    needed_condition = current_requirement["needed"]
-
-    # Determine how many courses we *can* take for this requirement (based on 'needed')
-    max_courses_for_req = float('inf')  # default max is infinity
-    if "<=" in needed_condition:
-        max_courses_for_req = int(needed_condition.split("<=")[1])
-    elif "=" in needed_condition:
-        max_courses_for_req = int(needed_condition.split("=")[1])
-    elif "<" in needed_condition:
-        max_courses_for_req = int(needed_condition.split("<")[1]) - 1
-    elif ">=" in needed_condition:
-        max_courses_for_req = float('inf')  # actually limited by total program credits/other reqs
-    elif ">" in needed_condition:
-        max_courses_for_req = float('inf')  # actually limited by total program credits/other reqs
-
-    def generate_combinations_for_requirement(candidate_index, courses_taken_for_req, current_program_courses):
+    course_options = ctx.candidate_ids[requirement_index]
+    needed_min, needed_max = current_requirement.min_count, current_requirement.max_count
+    min_courses_for_req, max_courses_for_req = ctx.count_bounds[requirement_index]
+    min_credit = ctx.min_credit
+    max_credit = ctx.max_credit
+    best_credits_here = ctx.credit_bounds.best[requirement_index]
+    best_credits_after = ctx.credit_bounds.suffix[requirement_index + 1]
+    constraints = ctx.constraints
+    max_days = constraints.max_days if constraints else float('inf')
+    must_deadline = ctx.must_deadlines[requirement_index] if constraints else ()
+    bound = ctx.bound
+    group_ids = table.group_ids
+    has_siblings = table.has_siblings
+    # A section counts for every requirement that lists it, so the ones earlier requirements took count here too
+    decided_mask = ctx.decided_masks[requirement_index]
+    already_counted = (state.selected & decided_mask).bit_count() if decided_mask else 0
+
+    def generate_combinations_for_requirement(candidate_index):
         if cancel_event and cancel_event.is_set():
             return
 
+        # Stop if nothing below this point can beat the programs already kept by the bound
+        if bound is not None and bound.prunes(state):
+            return
+
+        courses_taken_for_req = already_counted + state.req_counts[requirement_index]
         if courses_taken_for_req > max_courses_for_req:  # Stop if we've taken too many for this requirement
             return
 
+        # Stop if the remaining candidates cannot bring the count up to the minimum
+        if courses_taken_for_req + len(course_options) - candidate_index < min_courses_for_req:
+            return
+
+        # Stop if even the best remaining choices cannot reach the minimum credit load
+        best_row = best_credits_here[candidate_index]
+        slots_left = min(max_courses_for_req - courses_taken_for_req, len(best_row) - 1)
+        if state.credits + best_row[slots_left] + best_credits_after < min_credit:
+            return
+
         if candidate_index == len(course_options):  # Reached end of candidates for this requirement
-            if check_satisfied(needed_condition, courses_taken_for_req):  # Check if we satisfied the needed condition
-                _generate_programs(requirement_index + 1, current_program_courses, requirements,
-                                   courses, min_credit, max_credit, possible_programs, cancel_event)  # Move to next requirement
+            if needed_min <= courses_taken_for_req <= needed_max:  # Check if we satisfied the needed condition
+                yield from _iter_programs(requirement_index + 1, state, ctx)  # Move to next requirement
             return
 
-        # Option A: Don't take the current candidate course
-        generate_combinations_for_requirement(candidate_index + 1, courses_taken_for_req, current_program_courses)
+        candidate_id = course_options[candidate_index]
+
+        # Option A: Don't take the current candidate course, unless it is a must-course
+        if candidate_id not in must_deadline:
+            yield from generate_combinations_for_requirement(candidate_index + 1)
 
         # Early exit if a cancel was requested during the first recursive branch
         if cancel_event and cancel_event.is_set():
             return
 
         # Option B: Take the current candidate course if no conflict
-        candidate_course_code = course_options[candidate_index]
-        candidate_course = courses[candidate_course_code]
-        # Construct current program schedule for conflict check
-        current_program_schedule_for_check = {
-            "schedule": []}
-        for course_code in current_program_courses:
-            current_program_schedule_for_check["schedule"].extend(courses[course_code].schedule)
+        if courses_taken_for_req == max_courses_for_req:
+            return
+        # Never take two sections of the same course
+        if has_siblings and state.groups >> group_ids[candidate_id] & 1:
+            return
+        # Skip the course if it would exceed the maximum credit load or the allowed number of days
+        if state.credits + table.credits[candidate_id] > max_credit:
+            return
+        if (state.days | table.day_masks[candidate_id]).bit_count() > max_days:
+            return
+        # The occupied state is accumulated on the way down, so the check never rebuilds the schedule
+        if not state.backend.conflicts(state.occupied, table, candidate_id):
+            state.push(candidate_id, requirement_index)
+            yield from generate_combinations_for_requirement(candidate_index + 1)
+            state.pop(requirement_index)
+
+    yield from generate_combinations_for_requirement(0)
 
-        if not check_program_course_conflict(current_program_schedule_for_check, candidate_course.schedule):
-            updated_program_courses = current_program_courses.copy()
-            # updated_program_courses[candidate_course_code] = candidate_course
-            updated_program_courses.append(candidate_course_code)
-            generate_combinations_for_requirement(candidate_index + 1, courses_taken_for_req + 1,
-                                                  updated_program_courses)
 
-    generate_combinations_for_requirement(0, 0, current_program_courses.copy())
+# Steps of a frame on the explicit stack of _iter_programs_iterative
+_ENTER = 0  # Check the node and schedule the subtree without the candidate
+_TAKE = 1  # The subtree without the candidate is done: take the candidate if it fits
+_UNDO = 2  # The subtree with the candidate is done: put it back
+# Nodes between progress reports, cancel checks and checkpoint saves of the iterative engine
+_PROGRESS_NODES = 1024
 
 
-def generate_programs(requirements, courses, min_credit_param, max_credit_param, cancel_event):
+def _iter_programs_iterative(requirement_index, state, ctx, stack=None, checkpoint=None):
+    """
+    The search of _iter_programs, driven by an explicit stack instead of nested generators.
+
+    It visits the same nodes in the same order and yields the same programs, but a deep search
+    costs no Python frames, so hundreds of candidates neither slow every yield down nor hit the
+    recursion limit. A stack entry is a compact (requirement index, candidate index, step) frame;
+    together with the sections in the search state it describes the whole search position.
+
+    Args:
+        requirement_index (int): The requirement to start at, when no stack is given.
+        state (_SearchState): The search state to continue from.
+        ctx (_SearchContext): The search context.
+        stack (list, optional): A saved stack to resume, with `state` rebuilt from the same checkpoint.
+        checkpoint (SearchCheckpoint, optional): Receives ("stack", stack, chosen, req_counts)
+            frontiers now and then and when the search is cancelled.
+
+    Every _ENTER frame is one search node; ctx.progress, if set, is told about them every
+    _PROGRESS_NODES nodes and once more when the search stops.
+    """
+    cancel_event = ctx.cancel_event
+    progress = ctx.progress
+    requirements = ctx.requirements
+    requirement_count = len(requirements)
+    table = ctx.table
+    backend = state.backend
+    candidate_ids = ctx.candidate_ids
+    decided_masks = ctx.decided_masks
+    count_bounds = ctx.count_bounds
+    best_credits = ctx.credit_bounds.best
+    best_credits_after = ctx.credit_bounds.suffix
+    min_credit, max_credit = ctx.min_credit, ctx.max_credit
+    constraints = ctx.constraints
+    max_days = constraints.max_days if constraints else float('inf')
+    must_deadlines = ctx.must_deadlines or [()] * requirement_count
+    bound = ctx.bound
+    split_depth = ctx.split_depth
+    credits_of = table.credits
+    day_masks = table.day_masks
+    group_ids = table.group_ids
+    has_siblings = table.has_siblings
+    req_counts = state.req_counts
+    # Sections earlier requirements took that requirement i counts too, set on entering it
+    already_counted = [0] * (requirement_count + 1)
+
+    def frontier(frame):
+        return "stack", stack + [frame], state.chosen.copy(), req_counts.copy()
+
+    if stack is None:
+        stack = [(requirement_index, 0, _ENTER)]
+    else:
+        stack = list(stack)
+        for i in range(requirement_count):
+            if decided_masks[i]:
+                already_counted[i] = (state.selected & decided_masks[i]).bit_count()
+    nodes = 0
+    while stack:
+        frame = stack.pop()
+        i, j, step = frame
+
+        if step == _ENTER:
+            nodes += 1
+            if nodes == _PROGRESS_NODES:
+                if progress is not None:
+                    progress(nodes)
+                nodes = 0
+                if cancel_event and cancel_event.is_set():
+                    if checkpoint is not None:
+                        checkpoint.save(frontier(frame))
+                    return
+                if checkpoint is not None and checkpoint.due():
+                    checkpoint.save(frontier(frame))
+            if j == 0:
+                # Entering requirement i
+                if cancel_event and cancel_event.is_set():
+                    if progress is not None:
+                        progress(nodes)
+                    if checkpoint is not None:
+                        checkpoint.save(frontier(frame))
+                    return
+                if i == split_depth:
+                    yield state.chosen.copy(), req_counts[:i]
+                    continue
+                if i == requirement_count:
+                    program = _build_program(state, ctx)
+                    if program is not None:
+                        yield program
+                    continue
+                decided_mask = decided_masks[i]
+                already_counted[i] = (state.selected & decided_mask).bit_count() if decided_mask else 0
+
+            if bound is not None and bound.prunes(state):
+                continue
+            taken = already_counted[i] + req_counts[i]
+            min_courses, max_courses = count_bounds[i]
+            options = candidate_ids[i]
+            if taken > max_courses or taken + len(options) - j < min_courses:
+                continue
+            best_row = best_credits[i][j]
+            slots_left = min(max_courses - taken, len(best_row) - 1)
+            if state.credits + best_row[slots_left] + best_credits_after[i + 1] < min_credit:
+                continue
+
+            if j == len(options):
+                requirement = requirements[i]
+                if requirement.min_count <= taken <= requirement.max_count:
+                    stack.append((i + 1, 0, _ENTER))
+                continue
+            stack.append((i, j, _TAKE))
+            if options[j] not in must_deadlines[i]:
+                stack.append((i, j + 1, _ENTER))
+
+        elif step == _TAKE:
+            if already_counted[i] + req_counts[i] == count_bounds[i][1]:
+                continue
+            candidate_id = candidate_ids[i][j]
+            if has_siblings and state.groups >> group_ids[candidate_id] & 1:
+                continue
+            if state.credits + credits_of[candidate_id] > max_credit:
+                continue
+            if (state.days | day_masks[candidate_id]).bit_count() > max_days:
+                continue
+            if backend.conflicts(state.occupied, table, candidate_id):
+                continue
+            state.push(candidate_id, i)
+            stack.append((i, j, _UNDO))
+            stack.append((i, j + 1, _ENTER))
+
+        else:
+            state.pop(i)
+    if progress is not None:
+        progress(nodes)
+
+
+# Search engines selectable by name in generate_programs. Both produce the same programs in the same order.
+SEARCH_ENGINES = {
+    "iterative": _iter_programs_iterative,
+    "recursive": _iter_programs,
+}
+
+
+# --- Parallel generation ---
+# Subproblems are searched in worker processes. Each worker receives the run's inputs, with the
+# requirements as a RequirementPlan over its CourseTable, once through the pool initializer and
+# keeps its own search context for all of its tasks.
+
+# Aim for this many subproblems per worker so uneven subtrees still balance out
+_TASKS_PER_WORKER = 4
+# How often the parent checks cancel_event while it waits for a worker, in seconds
+_CANCEL_POLL_SECONDS = 0.1
+
+_worker_ctx = None
+_worker_backend = None
+_worker_engine = None
+
+
+def _init_worker(plan, min_credit, max_credit, conflict_backend, constraints, reorder, collapse, engine,
+                 cancel_event):
+    global _worker_ctx, _worker_backend, _worker_engine
+    _worker_ctx = _SearchContext(plan, min_credit, max_credit, cancel_event, constraints, reorder=reorder,
+                                 collapse=collapse)
+    _worker_backend = CONFLICT_BACKENDS[conflict_backend]
+    _worker_engine = SEARCH_ENGINES[engine]
+
+
+def _rebuild_state(backend, ctx, chosen, req_counts):
+    """Returns the search state reached by taking `chosen`, grouped by requirement as counted in req_counts."""
+    state = _SearchState(backend, ctx.table, len(ctx.requirements))
+    position = 0
+    for requirement_index, count in enumerate(req_counts):
+        for section_id in chosen[position:position + count]:
+            state.push(section_id, requirement_index)
+        position += count
+    return state
+
+
+def _search_subproblem(prefix):
+    """
+    Rebuilds the search state of a prefix and searches below it.
+
+    Returns:
+        tuple: (rows, nodes). Every program found, as a (section_ids, total_credits, day_mask, minutes)
+        row the parent attaches its own table to, and the number of search nodes visited. Occupancy
+        masks are left out to keep the rows small; the programs rebuild them when read.
+    """
+    ctx = _worker_ctx
+    chosen, req_counts = prefix
+    state = _rebuild_state(_worker_backend, ctx, chosen, req_counts)
+    visited = []
+    ctx.progress = visited.append
+    rows = [(program.section_ids, program.total_credits, program.day_mask, program.minutes)
+            for program in _worker_engine(len(req_counts), state, ctx)]
+    return rows, sum(visited)
+
+
+def _subproblem_programs(ctx, rows, nodes):
+    """Reports the nodes of a searched subproblem and yields its rows as programs of the run's table."""
+    if ctx.progress is not None:
+        ctx.progress(nodes)
+    table = ctx.table
+    alternative_ids = ctx.alternative_ids
+    for row in rows:
+        yield Program(table, *row, alternative_ids)
+
+
+def _split_search(ctx, backend, engine, workers):
+    """
+    Splits the search tree at the first one or two requirements.
+
+    Returns:
+        tuple: (prefixes, nodes). The (chosen, req_counts) prefixes in the order the sequential search
+        visits them, and the search nodes above them. The workers visit the prefix nodes themselves,
+        so those are not included.
+    """
+    progress = ctx.progress
+    prefixes = []
+    visited = []
+    for depth in (1, 2):
+        if depth >= len(ctx.requirements):
+            break
+        ctx.split_depth = depth
+        # Only the last split's nodes count: a deeper split visits the shallower one's again
+        visited = []
+        ctx.progress = visited.append
+        prefixes = list(engine(0, _SearchState(backend, ctx.table, len(ctx.requirements)), ctx))
+        if len(prefixes) >= workers * _TASKS_PER_WORKER:
+            break
+    ctx.split_depth = None
+    ctx.progress = progress
+    # Engines that report no nodes report none here either
+    return prefixes, sum(visited) - len(prefixes) if visited else 0
+
+
+def _iter_programs_parallel(plan, min_credit, max_credit, cancel_event, conflict_backend, constraints, reorder,
+                            collapse, engine, ctx, workers, prefixes=None, checkpoint=None):
+    """
+    Searches the subtrees of the first requirements in worker processes.
+
+    Each subtree's programs are yielded as soon as its worker finishes, so the order depends on
+    which subtrees finish first. When a checkpoint is given, the prefixes still to be searched are
+    saved as ("prefixes", [...]) frontiers between subtrees; a saved list can be passed back as
+    `prefixes` to resume.
+    """
+    backend = CONFLICT_BACKENDS[conflict_backend]
+    if prefixes is None:
+        prefixes, split_nodes = _split_search(ctx, backend, SEARCH_ENGINES[engine], workers)
+        if len(prefixes) < 2:
+            # Nothing worth spreading out
+            state = _SearchState(backend, ctx.table, len(ctx.requirements))
+            if checkpoint is not None and engine == "iterative":
+                yield from _iter_programs_iterative(0, state, ctx, checkpoint=checkpoint)
+            else:
+                yield from SEARCH_ENGINES[engine](0, state, ctx)
+            return
+        if ctx.progress is not None:
+            ctx.progress(split_nodes)
+    if not prefixes:
+        return
+
+    # Spawned rather than forked: the GUI starts the pool from a worker thread, and forking a
+    # multi-threaded process can leave the child deadlocked on a lock another thread held
+    mp_context = multiprocessing.get_context("spawn")
+    worker_cancel_event = mp_context.Event()
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(prefixes))), mp_context=mp_context, initializer=_init_worker,
+        initargs=(plan, min_credit, max_credit, conflict_backend, constraints, reorder, collapse, engine,
+                  worker_cancel_event))
+    try:
+        futures = {executor.submit(_search_subproblem, prefix): prefix for prefix in prefixes}
+        pending = set(futures)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=_CANCEL_POLL_SECONDS,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            # Searched subtrees are handed over even once the run is cancelled, for callers that
+            # keep what a stopped search found; only the others are left for a resumed run
+            for future in done:
+                yield from _subproblem_programs(ctx, *future.result())
+            cancelled = cancel_event and cancel_event.is_set()
+            if checkpoint is not None and (cancelled or (done and checkpoint.due())):
+                checkpoint.save(("prefixes", [prefix for future, prefix in futures.items() if future in pending]))
+            if cancelled:
+                return
+    finally:
+        # Also reached when the consumer stops early: stop the workers instead of waiting on them
+        worker_cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_programs_checkpointed(plan, min_credit, max_credit, cancel_event, conflict_backend, constraints, reorder,
+                                collapse, ctx, workers, checkpoint):
+    """
+    Runs the search with the iterative engine while the checkpoint records its programs and
+    frontiers, continuing from the frontier the checkpoint has loaded, if any.
+    """
+    # Programs found before an interruption come first, as they did in the interrupted run. They are
+    # already in the checkpoint file, so they are neither recorded again nor kept once handed out.
+    yield from checkpoint.programs
+    checkpoint.programs = ProgramSet()
+
+    backend = CONFLICT_BACKENDS[conflict_backend]
+    frontier = checkpoint.frontier
+    if frontier is not None and frontier[0] == "stack":
+        _, stack, chosen, req_counts = frontier
+        state = _rebuild_state(backend, ctx, chosen, req_counts)
+        programs = _iter_programs_iterative(0, state, ctx, stack=stack, checkpoint=checkpoint)
+    elif frontier is not None or (workers and workers > 1):
+        prefixes = frontier[1] if frontier is not None else None
+        programs = _iter_programs_parallel(plan, min_credit, max_credit, cancel_event, conflict_backend, constraints,
+                                           reorder, collapse, "iterative", ctx, workers or 1, prefixes, checkpoint)
+    else:
+        state = _SearchState(backend, ctx.table, len(ctx.requirements))
+        programs = _iter_programs_iterative(0, state, ctx, checkpoint=checkpoint)
+    for program in programs:
+        checkpoint.record(program)
+        yield program
+
+
+def iter_programs(requirements, courses, min_credit_param, max_credit_param, cancel_event=None,
+                  conflict_backend="bitmask", constraints=None, bound=None, workers=1, reorder=True,
+                  collapse_equivalent=False, engine="iterative", checkpoint=None, progress=None):
+    """
+    Yields the course programs that satisfy the given requirements and credit limits, one at a
+    time as the search finds them. Nothing is accumulated, so callers can filter, count or keep
+    only the best programs without holding the whole result set in memory. A section listed by
+    several requirements counts toward each of them, and every course set is produced once.
+
+    Args:
+        requirements: A list of requirement dictionaries, or a RequirementPlan from compile_requirements.
+            Dictionaries are compiled first; candidate codes missing from `courses` are skipped.
+        courses: A dictionary of course information, keyed by course code. Not used when a plan is given.
+        min_credit_param: The minimum total credits for a valid program (30 if None).
+        max_credit_param: The maximum total credits for a valid program (42 if None).
+        cancel_event (threading.Event, optional): Event to signal cancellation. The stream ends early when set;
+            anything with an is_set() method will do, such as a time budget. With workers, the subtrees
+            already searched when it is set are still yielded.
+        conflict_backend (str, optional): Key of CONFLICT_BACKENDS used for time conflict checks.
+        constraints (dict, optional): Search constraints from Config.search_constraints. Only programs
+            that pass the matching display filters are produced, and the search prunes with them.
+        bound (TopKPrograms, optional): Cuts branches that cannot beat the programs it has kept so far.
+            The caller offers the programs it wants ranked to it; the stream may then skip programs
+            that would not have made the cut.
+        workers (int, optional): Number of worker processes. With more than one, subtrees of the first
+            requirements are searched in parallel and merged back as they finish, so the programs
+            arrive in a different order. A bound is only honoured by the sequential search, so
+            workers is ignored when one is given.
+        reorder (bool, optional): Search the most constrained requirements and candidates first
+            (see RequirementPlan.ordered). The same programs are produced, with their courses listed
+            in the user's order, but the programs arrive in a different order.
+        collapse_equivalent (bool, optional): Search one section of each course per distinct time
+            pattern. Sections of the same course with the same credits and meeting times are merged,
+            and each program lists the merged ones in program['alternatives']; Program.expand()
+            gives back the individual programs.
+        engine (str, optional): Key of SEARCH_ENGINES that runs the search.
+        checkpoint (SearchCheckpoint, optional): Saves the programs found so far and the search
+            frontier now and then and on cancellation. If it has loaded a saved frontier, the
+            recorded programs are yielded first and the search continues from there. Uses the
+            iterative engine; ignored when a bound is given.
+        progress (callable, optional): Called now and then with the number of search nodes visited
+            since its previous call, for progress displays (see estimate_search). Only the iterative
+            engine reports; with workers, each subtree is reported when its results arrive.
+
+    Yields:
+        Program: A compact program record. program['courses'] (list of course codes), program['schedule']
+        (combined schedule), 'total_credits', 'total_days', 'total_hours' and 'total_courses' read like
+        the keys of a dictionary.
+
+    Raises:
+        RequirementError: If a requirement dictionary is malformed.
+    """
+    # Defaults
+    min_credit = 30 if min_credit_param is None else min_credit_param
+    max_credit = 42 if max_credit_param is None else max_credit_param
+
+    plan = requirements if isinstance(requirements, RequirementPlan) else compile_requirements(requirements, courses)
+    ctx = _SearchContext(plan, min_credit, max_credit, cancel_event, constraints, bound, reorder=reorder,
+                         collapse=collapse_equivalent, progress=progress)
+    if ctx.constraints and ctx.constraints.impossible:
+        return  # A must-course is not available in any requirement
+    if checkpoint is not None and bound is None:
+        yield from _iter_programs_checkpointed(plan, min_credit, max_credit, cancel_event, conflict_backend,
+                                               constraints, reorder, collapse_equivalent, ctx, workers, checkpoint)
+        return
+    if workers and workers > 1 and bound is None:
+        yield from _iter_programs_parallel(plan, min_credit, max_credit, cancel_event, conflict_backend,
+                                           constraints, reorder, collapse_equivalent, engine, ctx, workers)
+        return
+    state = _SearchState(CONFLICT_BACKENDS[conflict_backend], ctx.table, len(ctx.requirements))
+    yield from SEARCH_ENGINES[engine](0, state, ctx)
+
+
+def generate_programs(requirements, courses, min_credit_param, max_credit_param, cancel_event,
+                      conflict_backend="bitmask", workers=1, reorder=True, collapse_equivalent=False,
+                      engine="iterative"):
     """
     Generates a list of possible course programs that satisfy the given requirements and credit limits.
 
     Args:
-        requirements: A list of requirement dictionaries.
+        requirements: A list of requirement dictionaries, or a RequirementPlan.
         courses: A dictionary of course information, keyed by course code.
         min_credit: The minimum total credits for a valid program.
         max_credit: The maximum total credits for a valid program.
         cancel_event (threading.Event, optional): Event to signal cancellation.
+        conflict_backend (str, optional): Key of CONFLICT_BACKENDS used for time conflict checks.
+        workers (int, optional): Number of worker processes used for the search.
+        reorder (bool, optional): Search the most constrained requirements first (see iter_programs).
+        collapse_equivalent (bool, optional): Merge sections with the same course, credits and
+            meeting times (see iter_programs).
+        engine (str, optional): Key of SEARCH_ENGINES that runs the search.
 
     Returns:
-        A list of dictionaries, where each dictionary represents a valid course program.
-        Each program dictionary contains 'courses' (list of course codes), 'schedule' (combined schedule),
-        'total_credits', 'total_days', and 'total_hours'.
+        ProgramSet: The valid course programs, stored column-wise. Indexing or iterating it gives Program
+        records with 'courses' (list of course codes), 'schedule' (combined schedule), 'total_credits',
+        'total_days', 'total_hours' and 'total_courses'.
     """
+    return ProgramSet(iter_programs(requirements, courses, min_credit_param, max_credit_param, cancel_event,
+                                    conflict_backend, workers=workers, reorder=reorder,
+                                    collapse_equivalent=collapse_equivalent, engine=engine))
 
 
-    possible_programs = []
+# --- Counting ---
+# Counts programs without building them. Below any point of the search, the number of programs
+# only depends on the part of the state later choices can see, so subtrees reached with the same
+# visible state are counted once. The same counts also let programs be drawn uniformly at random.
 
-    # Defaults
+def _program_counter(ctx, per_variant=True):
+    """
+    Sets up the memoized count of the programs of a search context.
+
+    The memo key at candidate j of requirement i holds the count taken so far, the credits, and
+    what later choices can still observe: the occupied time slots and courses of the remaining
+    candidates, the chosen sections later requirements count, the day mask when the constraints
+    look at days, and whether an include-course has been taken. Sections merged into one class
+    by _collapse_equivalent_sections count once per member, or once for the whole class when
+    per_variant is False.
+
+    Returns:
+        tuple: (total, draw). total() returns the number of programs, or None when cancel_event
+        was set. draw(rng) walks down the counted tree, taking each branch with probability
+        proportional to its programs, and returns the (chosen, req_counts) of one program; every
+        program is equally likely once its merged sections are picked uniformly. Only call draw
+        after total() found programs.
+    """
+    table = ctx.table
+    requirements = ctx.requirements
+    candidate_ids = ctx.candidate_ids
+    requirement_count = len(requirements)
+    time_masks = table.time_masks
+    group_ids = table.group_ids
+    credits_of = table.credits
+    has_siblings = table.has_siblings
+    min_credit, max_credit = ctx.min_credit, ctx.max_credit
+    cancel_event = ctx.cancel_event
+
+    multiplicity = [1] * len(table)
+    if per_variant:
+        for section_id, others in (ctx.alternative_ids or {}).items():
+            multiplicity[section_id] = 1 + len(others)
+
+    # Occupied slots and courses that still matter at candidate j of requirement i
+    visible_time = [None] * requirement_count
+    visible_groups = [None] * requirement_count
+    time_after = groups_after = 0
+    for i in range(requirement_count - 1, -1, -1):
+        ids = candidate_ids[i]
+        times = [time_after] * (len(ids) + 1)
+        groups = [groups_after] * (len(ids) + 1)
+        for j in range(len(ids) - 1, -1, -1):
+            times[j] = times[j + 1] | time_masks[ids[j]]
+            groups[j] = groups[j + 1] | 1 << group_ids[ids[j]]
+        visible_time[i], visible_groups[i] = times, groups
+        time_after, groups_after = times[0], groups[0]
+    # Sections that requirements after i count although an earlier requirement decides them
+    counted_later = [0] * (requirement_count + 1)
+    for i in range(requirement_count - 1, 0, -1):
+        counted_later[i - 1] = counted_later[i] | ctx.decided_masks[i]
+    decided_masks = ctx.decided_masks + [0]
+
+    constraints = ctx.constraints
+    max_days = constraints.max_days if constraints else float('inf')
+    track_days = constraints is not None and (max_days != float('inf') or constraints.required_day_mask
+                                              or constraints.day_condition is not None)
+    include_ids = constraints.include_ids if constraints and constraints.include else ()
+    must_deadlines = ctx.must_deadlines or [()] * requirement_count
+    memo = {}
+
+    def leaf_accepts(credits, days, included):
+        if not min_credit <= credits <= max_credit:
+            return False
+        if constraints is None:
+            return True
+        # Must-courses are forced by their deadlines, so only these leaf checks remain
+        if constraints.include and not included:
+            return False
+        if constraints.required_day_mask & ~days:
+            return False
+        if constraints.day_condition:
+            op_func, value = constraints.day_condition
+            if not op_func(days.bit_count(), value):
+                return False
+        return True
+
+    def node(i, j, taken, credits, occupied, days, groups, selected, included):
+        """Returns the memo key of a count, or the count itself past the last requirement."""
+        if i == requirement_count:
+            return 1 if leaf_accepts(credits, days, included) else 0
+        return (i, j, taken, credits, occupied & visible_time[i][j], days, groups & visible_groups[i][j], selected,
+                included)
+
+    def branches(key):
+        """Returns the (multiplicity, child node) pairs whose counts add up to the count of a memo key."""
+        i, j, taken, credits, occupied, days, groups, selected, included = key
+        ids = candidate_ids[i]
+        min_courses, max_courses = ctx.count_bounds[i]
+        best_row = ctx.credit_bounds.best[i][j]
+        slots_left = min(max_courses - taken, len(best_row) - 1)
+        if (taken > max_courses or taken + len(ids) - j < min_courses
+                or credits + best_row[slots_left] + ctx.credit_bounds.suffix[i + 1] < min_credit):
+            return ()
+        if j == len(ids):
+            requirement = requirements[i]
+            if not requirement.min_count <= taken <= requirement.max_count:
+                return ()
+            if cancel_event and cancel_event.is_set():
+                return ()
+            already_counted = (selected & decided_masks[i + 1]).bit_count()
+            return ((1, node(i + 1, 0, already_counted, credits, occupied, days, groups,
+                             selected & counted_later[i + 1], included)),)
+
+        result = []
+        candidate_id = ids[j]
+        if candidate_id not in must_deadlines[i]:
+            result.append((1, node(i, j + 1, taken, credits, occupied, days, groups, selected, included)))
+        new_credits = credits + credits_of[candidate_id]
+        new_days = days | table.day_masks[candidate_id] if track_days else 0
+        if (taken < max_courses and new_credits <= max_credit and new_days.bit_count() <= max_days
+                and not occupied & time_masks[candidate_id]
+                and not (has_siblings and groups >> group_ids[candidate_id] & 1)):
+            if counted_later[i] >> candidate_id & 1:
+                new_selected = selected | 1 << candidate_id
+            else:
+                new_selected = selected
+            result.append((multiplicity[candidate_id], node(
+                i, j + 1, taken + 1, new_credits, occupied | time_masks[candidate_id], new_days,
+                groups | 1 << group_ids[candidate_id], new_selected, included or candidate_id in include_ids)))
+        return result
+
+    def count(i, j, taken, credits, occupied, days, groups, selected, included):
+        # Evaluated with an explicit stack: a recursive count would nest once per candidate and
+        # hit the recursion limit on catalogs the iterative search engine handles
+        root = node(i, j, taken, credits, occupied, days, groups, selected, included)
+        if not isinstance(root, tuple):
+            return root
+        stack = [(root, None)]
+        while stack:
+            key, children = stack[-1]
+            if key in memo:
+                stack.pop()
+                continue
+            if children is None:
+                children = branches(key)
+                stack[-1] = (key, children)
+                pending = [child for _, child in children if isinstance(child, tuple) and child not in memo]
+                if pending:
+                    stack.extend((child, None) for child in pending)
+                    continue
+            memo[key] = sum(factor * (memo[child] if isinstance(child, tuple) else child)
+                            for factor, child in children)
+            stack.pop()
+        return memo[root]
+
+    def total():
+        if requirement_count == 0:
+            return 1 if leaf_accepts(0, 0, False) else 0
+        result = count(0, 0, 0, 0, 0, 0, 0, 0, False)
+        if cancel_event and cancel_event.is_set():
+            return None
+        return result
+
+    def draw(rng):
+        # The same arguments count() passes to its children, so every call is a memo hit
+        taken = credits = occupied = days = groups = selected = 0
+        included = False
+        remaining = count(0, 0, 0, 0, 0, 0, 0, 0, False) if requirement_count else 1
+        chosen = []
+        req_counts = [0] * requirement_count
+        i = j = 0
+        while i < requirement_count:
+            ids = candidate_ids[i]
+            if j == len(ids):
+                taken = (selected & decided_masks[i + 1]).bit_count()
+                selected &= counted_later[i + 1]
+                i, j = i + 1, 0
+                continue
+            candidate_id = ids[j]
+            skipped = 0
+            if candidate_id not in must_deadlines[i]:
+                skipped = count(i, j + 1, taken, credits, occupied, days, groups, selected, included)
+            if rng.randrange(remaining) < skipped:
+                remaining = skipped
+            else:
+                remaining = (remaining - skipped) // multiplicity[candidate_id]
+                taken += 1
+                credits += credits_of[candidate_id]
+                if track_days:
+                    days |= table.day_masks[candidate_id]
+                occupied |= time_masks[candidate_id]
+                groups |= 1 << group_ids[candidate_id]
+                if counted_later[i] >> candidate_id & 1:
+                    selected |= 1 << candidate_id
+                included = included or candidate_id in include_ids
+                chosen.append(candidate_id)
+                req_counts[i] += 1
+            j += 1
+        return chosen, req_counts
+
+    return total, draw
+
+
+def _count_programs(ctx, per_variant=True):
+    """
+    Counts the programs of a search context by memoized search (see _program_counter).
+
+    Returns:
+        int or None: The number of programs, or None when cancel_event was set.
+    """
+    return _program_counter(ctx, per_variant)[0]()
+
+
+def count_programs(requirements, courses, min_credit_param, max_credit_param, cancel_event=None, constraints=None,
+                   reorder=True, collapse_equivalent=False):
+    """
+    Counts the programs iter_programs would produce, without producing them.
+
+    Partial programs that leave later choices facing the same situation are counted once, so
+    requirement sets with a huge number of programs are counted in a fraction of the time needed
+    to list them. Useful as a pre-flight check before generating.
+
+    Args:
+        requirements: A list of requirement dictionaries, or a RequirementPlan.
+        courses: A dictionary of course information, keyed by course code. Not used when a plan is given.
+        min_credit_param: The minimum total credits for a valid program (30 if None).
+        max_credit_param: The maximum total credits for a valid program (42 if None).
+        cancel_event (threading.Event, optional): Event to signal cancellation.
+        constraints (dict, optional): Search constraints from Config.search_constraints, as in iter_programs.
+        reorder (bool, optional): Search the most constrained requirements first (see iter_programs).
+        collapse_equivalent (bool, optional): Count the programs iter_programs yields with
+            collapse_equivalent, one for all the variants of its merged sections, instead of
+            every individual program.
+
+    Returns:
+        int or None: The number of valid programs, or None if cancelled.
+
+    Raises:
+        RequirementError: If a requirement dictionary is malformed.
+    """
+    min_credit = 30 if min_credit_param is None else min_credit_param
+    max_credit = 42 if max_credit_param is None else max_credit_param
+
+    plan = requirements if isinstance(requirements, RequirementPlan) else compile_requirements(requirements, courses)
+    ctx = _SearchContext(plan, min_credit, max_credit, cancel_event, constraints, reorder=reorder, collapse=True)
+    if ctx.constraints and ctx.constraints.impossible:
+        return 0
+    return _count_programs(ctx, per_variant=not collapse_equivalent)
+
+
+
+def sample_programs(requirements, courses, min_credit_param, max_credit_param, sample_size, seed=None,
+                    cancel_event=None, constraints=None, reorder=True):
+    """
+    Draws distinct programs uniformly at random from everything iter_programs would produce,
+    without producing it all.
+
+    The programs are counted first as in count_programs; each draw then walks down the search
+    tree once, choosing every branch in proportion to the programs below it. When the sample
+    would be at least half of all programs, they are enumerated and sampled directly instead.
+
+    Args:
+        requirements: A list of requirement dictionaries, or a RequirementPlan.
+        courses: A dictionary of course information, keyed by course code. Not used when a plan is given.
+        min_credit_param: The minimum total credits for a valid program (30 if None).
+        max_credit_param: The maximum total credits for a valid program (42 if None).
+        sample_size (int): How many programs to draw. All of them are returned when there are fewer.
+        seed (optional): Seed of the random draws. The same seed gives the same sample.
+        cancel_event (threading.Event, optional): Event to signal cancellation.
+        constraints (dict, optional): Search constraints from Config.search_constraints, as in iter_programs.
+        reorder (bool, optional): Search the most constrained requirements first (see iter_programs).
+
+    Returns:
+        ProgramSet: The sampled programs, in the order they were drawn. Empty if cancelled while counting.
+
+    Raises:
+        RequirementError: If a requirement dictionary is malformed.
+    """
     min_credit = 30 if min_credit_param is None else min_credit_param
     max_credit = 42 if max_credit_param is None else max_credit_param
 
-    _generate_programs(0, [], requirements, courses, min_credit, max_credit, possible_programs, cancel_event)
-    return possible_programs
+    plan = requirements if isinstance(requirements, RequirementPlan) else compile_requirements(requirements, courses)
+    ctx = _SearchContext(plan, min_credit, max_credit, cancel_event, constraints, reorder=reorder, collapse=True)
+    if ctx.constraints and ctx.constraints.impossible:
+        return ProgramSet()
+    total, draw = _program_counter(ctx)
+    program_count = total()
+    if program_count is None:
+        return ProgramSet()
+    rng = random.Random(seed)
+
+    if sample_size * 2 >= program_count:
+        programs = list(iter_programs(plan, courses, min_credit, max_credit, cancel_event, constraints=constraints,
+                                      reorder=reorder))
+        if len(programs) > sample_size:
+            programs = rng.sample(programs, sample_size)
+        return ProgramSet(programs, ctx.table)
+
+    backend = CONFLICT_BACKENDS["bitmask"]
+    alternative_ids = ctx.alternative_ids or {}
+    samples = ProgramSet(table=ctx.table)
+    seen = set()
+    while len(samples) < sample_size:
+        if cancel_event and cancel_event.is_set():
+            break
+        chosen, req_counts = draw(rng)
+        program = _build_program(_rebuild_state(backend, ctx, chosen, req_counts), ctx)
+        # Swap each merged section for one of its class, so every member is as likely
+        section_ids = tuple(rng.choice((section_id,) + alternative_ids[section_id])
+                            if section_id in alternative_ids else section_id for section_id in program.section_ids)
+        if section_ids in seen:
+            continue
+        seen.add(section_ids)
+        samples.append(Program(ctx.table, section_ids, program.total_credits, program.day_mask, program.minutes))
+    return samples
+
+# --- Estimating ---
+# Predicts the size of a search before running it, with Chen's stratified sampling, a refinement
+# of Knuth's random-probe estimator. A probe walks the search tree level by level; the nodes of a
+# level that look alike (same count taken at the requirement, same credits) form a stratum, and
+# one random node of each stratum stands for all of them, weighted by how many nodes it represents.
+# The summed weights are unbiased estimates of the tree's node and program counts.
+
+class SearchEstimate:
+    """The predicted size of a search, as returned by estimate_search."""
+
+    def __init__(self, nodes, programs, probes):
+        self.nodes = nodes  # Expected search nodes, as counted by the progress of iter_programs
+        self.programs = programs  # Expected programs produced
+        self.probes = probes  # Probes the estimate averages
+
+    def __repr__(self):
+        return f"<SearchEstimate: ~{self.nodes:.0f} nodes, ~{self.programs:.0f} programs>"
+
+
+def _probe_search(ctx, backend, rng):
+    """
+    Makes one stratified pass over the levels of the tree of _iter_programs_iterative, applying
+    its checks. Every candidate of every requirement is one level, so all nodes of a level are at
+    the same (requirement, candidate) position. A node is (occupied, days, credits, groups,
+    selected, chosen, req_counts), the part of a search state the checks read.
+
+    Returns:
+        tuple: (nodes, programs) estimates of the whole tree.
+    """
+    requirements = ctx.requirements
+    requirement_count = len(requirements)
+    table = ctx.table
+    constraints = ctx.constraints
+    max_days = constraints.max_days if constraints else float('inf')
+    must_deadlines = ctx.must_deadlines or [()] * requirement_count
+    level = [((backend.empty(), 0, 0, 0, 0, (), (0,) * requirement_count), 1)]
+    nodes = 0
+    i = j = 0
+    while level:
+        nodes += sum(weight for _, weight in level)
+        if j == 0 and i == requirement_count:
+            programs = 0
+            for (_, _, _, _, _, chosen, req_counts), weight in level:
+                state = _rebuild_state(backend, ctx, chosen, req_counts)
+                if _build_program(state, ctx) is not None:
+                    programs += weight
+            return nodes, programs
+
+        options = ctx.candidate_ids[i]
+        decided_mask = ctx.decided_masks[i]
+        min_courses, max_courses = ctx.count_bounds[i]
+        best_row = ctx.credit_bounds.best[i][j]
+        best_after = ctx.credit_bounds.suffix[i + 1]
+        strata = {}  # (taken, credits) -> [representative child, total weight]
+
+        def add(child, taken, weight):
+            stratum = strata.get((taken, child[2]))
+            if stratum is None:
+                strata[taken, child[2]] = [child, weight]
+            else:
+                stratum[1] += weight
+                if rng.random() * stratum[1] < weight:
+                    stratum[0] = child
+
+        for node, weight in level:
+            occupied, days, credits, groups, selected, chosen, req_counts = node
+            taken = req_counts[i] + ((selected & decided_mask).bit_count() if decided_mask else 0)
+            if taken > max_courses or taken + len(options) - j < min_courses:
+                continue
+            slots_left = min(max_courses - taken, len(best_row) - 1)
+            if credits + best_row[slots_left] + best_after < ctx.min_credit:
+                continue
+            if j == len(options):
+                if requirements[i].min_count <= taken <= requirements[i].max_count:
+                    add(node, 0, weight)
+                continue
+            candidate_id = options[j]
+            if candidate_id not in must_deadlines[i]:
+                add(node, taken, weight)
+            if (taken < max_courses and not (table.has_siblings and groups >> table.group_ids[candidate_id] & 1)
+                    and credits + table.credits[candidate_id] <= ctx.max_credit
+                    and (days | table.day_masks[candidate_id]).bit_count() <= max_days
+                    and not backend.conflicts(occupied, table, candidate_id)):
+                counts = list(req_counts)
+                counts[i] += 1
+                child = (backend.add(occupied, table, candidate_id), days | table.day_masks[candidate_id],
+                         credits + table.credits[candidate_id], groups | 1 << table.group_ids[candidate_id],
+                         selected | 1 << candidate_id, chosen + (candidate_id,), tuple(counts))
+                add(child, taken + 1, weight)
+
+        level = [tuple(stratum) for stratum in strata.values()]
+        if j == len(options):
+            i, j = i + 1, 0
+        else:
+            j += 1
+    return nodes, 0
+
+
+def estimate_search(requirements, courses, min_credit_param, max_credit_param, cancel_event=None, constraints=None,
+                    reorder=True, collapse_equivalent=False, probes=100, seed=None):
+    """
+    Estimates how many nodes iter_programs will visit and how many programs it will produce,
+    by stratified random probes of its search tree.
+
+    A probe keeps one node per stratum and level, so it costs a few milliseconds however large
+    the search is. The averages are unbiased; with the default probes they were within about 10%
+    of the real counts on the bundled catalogs (count_programs gives exact program counts).
+
+    Args:
+        requirements: A list of requirement dictionaries, or a RequirementPlan.
+        courses: A dictionary of course information, keyed by course code. Not used when a plan is given.
+        min_credit_param: The minimum total credits for a valid program (30 if None).
+        max_credit_param: The maximum total credits for a valid program (42 if None).
+        cancel_event (threading.Event, optional): Event to signal cancellation.
+        constraints (dict, optional): Search constraints from Config.search_constraints, as in iter_programs.
+        reorder (bool, optional): Search the most constrained requirements first (see iter_programs).
+        collapse_equivalent (bool, optional): Merge equivalent sections (see iter_programs).
+        probes (int, optional): Probes to average.
+        seed (optional): Seed for the random choices, for repeatable estimates.
+
+    Returns:
+        SearchEstimate or None: The expected node and program counts, or None if cancelled.
+
+    Raises:
+        RequirementError: If a requirement dictionary is malformed.
+    """
+    min_credit = 30 if min_credit_param is None else min_credit_param
+    max_credit = 42 if max_credit_param is None else max_credit_param
+
+    plan = requirements if isinstance(requirements, RequirementPlan) else compile_requirements(requirements, courses)
+    ctx = _SearchContext(plan, min_credit, max_credit, cancel_event, constraints, reorder=reorder,
+                         collapse=collapse_equivalent)
+    if ctx.constraints and ctx.constraints.impossible:
+        return SearchEstimate(0, 0, 0)
+    backend = CONFLICT_BACKENDS["bitmask"]
+    rng = random.Random(seed)
+    total_nodes = total_programs = 0
+    for _ in range(probes):
+        if cancel_event and cancel_event.is_set():
+            return None
+        nodes, programs = _probe_search(ctx, backend, rng)
+        total_nodes += nodes
+        total_programs += programs
+    return SearchEstimate(total_nodes / probes, total_programs / probes, probes)
@@ -1,4 +1,7 @@
-from src.program_generator import time_to_minutes
+import heapq
+
+from src.program_set import ProgramSet
+from src.time_masks import time_to_minutes
 
 # --- NEW: Map translated day names back to the Turkish names found in the data file ---
 # This allows us to look up schedule data regardless of the display language.
@@ -16,12 +19,16 @@ DAY_NAME_MAP_TO_TURKISH = {
     "Cuma": "Cuma",
 }
 
-def format_program_info(program, courses, include_schedule, loc_manager):
+def format_program_info(program, courses, include_schedule, loc_manager, program_index):
     loc = loc_manager
-    program_output = loc.get_string('program_header', index=program['program_index'])
+    program_output = loc.get_string('program_header', index=program_index)
     program_output += loc.get_string('courses_header')
+    alternatives = getattr(program, 'alternatives', None) or {}
     for course_code in program['courses']:
-        program_output += f" {course_code} |"
+        program_output += f" {course_code}"
+        if course_code in alternatives:
+            program_output += loc.get_string('alternative_sections', codes=", ".join(alternatives[course_code]))
+        program_output += " |"
     program_output += "\n"
     program_output += loc.get_string('total_credits_header', credits=program['total_credits'])
     program_output += loc.get_string('total_days_header', days=program['total_days'])
@@ -128,23 +135,34 @@ def list_programs(programs, courses, loc_manager, filter_function=None, sort_fun
     if cancel_event and cancel_event.is_set():
         return [], "".join(output_parts)
 
+    # 'programs' may be a lazy stream from iter_programs; it is consumed exactly once here.
+    # Kept programs go into a ProgramSet, which stores them compactly.
     summarized_programs = programs
     if filter_function:
-        summarized_programs = list(filter(filter_function, summarized_programs))
+        summarized_programs = ProgramSet(filter(filter_function, summarized_programs))
         output_parts.append(loc.get_string('filter_log', desc=filter_description))
         print(f"Filtered. Remained {len(summarized_programs)} programs")
+    elif not isinstance(summarized_programs, (ProgramSet, list)):
+        summarized_programs = ProgramSet(summarized_programs)
 
     # --- NEW: Check for cancellation before sorting ---
     if cancel_event and cancel_event.is_set():
         return [], "".join(output_parts)
 
+    total_programs = len(summarized_programs)
     if sort_function:
-        summarized_programs = sorted(summarized_programs, key=sort_function, reverse=sort_reverse)
+        if limit_results:
+            # Only the displayed programs need ordering: a bounded heap picks them without sorting everything.
+            # nsmallest/nlargest give the same order as sorted(...)[:limit_results], ties included.
+            select_top = heapq.nlargest if sort_reverse else heapq.nsmallest
+            summarized_programs = select_top(limit_results, summarized_programs, key=sort_function)
+        else:
+            summarized_programs = sorted(summarized_programs, key=sort_function, reverse=sort_reverse)
         rev_str = " (Descending)" if sort_reverse else ""
         output_parts.append(loc.get_string('sort_log', desc=sort_description, rev=rev_str))
         print(f"Sorted by: {sort_description}" + rev_str)
 
-    output_parts.append(loc.get_string('total_programs_log', count=len(summarized_programs)))
+    output_parts.append(loc.get_string('total_programs_log', count=total_programs))
 
     if print_wanted or save_txt:
         programs_to_print = summarized_programs[:limit_results] if limit_results else summarized_programs
@@ -167,8 +185,7 @@ def list_programs(programs, courses, loc_manager, filter_function=None, sort_fun
                     return summarized_programs, final_output_text
                 return None, None
 
-            program["program_index"] = i + 1
-            program_output = format_program_info(program, courses, include_schedule, loc)
+            program_output = format_program_info(program, courses, include_schedule, loc, program_index=i + 1)
             output_parts.append(program_output) # Append to the list (very fast)
 
             # --- THE UI OPTIMIZATION ---
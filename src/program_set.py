@@ -0,0 +1,214 @@
+# src/program_set.py
+"""Compact storage for generated programs: section IDs plus numeric stat columns."""
+from array import array
+from itertools import product
+
+from src.time_masks import earliest_start, idle_minutes, latest_finish, longest_day
+
+
+class Program:
+    """
+    One generated program, stored as section IDs of a CourseTable and its running totals.
+
+    Read it like the old program dicts: program['courses'], program['schedule'],
+    program['total_credits'], program['total_days'], program['total_hours'],
+    program['total_courses'], program['days'] and the day-span metrics program['idle_minutes'],
+    program['earliest_start'], program['latest_finish'] and program['longest_day'] (all in
+    minutes). Codes and schedules are looked up in the table on demand instead of being copied
+    into every program.
+
+    The day-span metrics come from the weekly occupancy mask, which the search accumulates
+    while it builds the program. Programs read back from a ProgramSet rebuild it from their
+    sections the first time it is needed.
+
+    Programs searched with equivalent sections collapsed also carry alternative_ids, shared
+    by the whole run: it maps a section to the sections of the same course with the same
+    credits and meeting times, any of which could take its place.
+    """
+
+    __slots__ = ("table", "section_ids", "total_credits", "day_mask", "minutes", "_time_mask", "alternative_ids")
+
+    # Keys readable with program[key]
+    FIELDS = frozenset(("courses", "schedule", "total_credits", "total_days", "total_hours", "total_courses", "days",
+                        "alternatives", "idle_minutes", "earliest_start", "latest_finish", "longest_day"))
+
+    def __init__(self, table, section_ids, total_credits, day_mask, minutes, alternative_ids=None, time_mask=None):
+        self.table = table
+        self.section_ids = section_ids  # Tuple of section IDs, in the order they were taken
+        self.total_credits = total_credits
+        self.day_mask = day_mask  # One bit per day the program meets on (see time_masks.day_index)
+        self.minutes = minutes  # Scheduled minutes per week
+        self.alternative_ids = alternative_ids  # {section ID: tuple of equivalent section IDs}, or None
+        self._time_mask = time_mask  # Weekly occupancy mask, or None until time_mask is first read
+
+    @property
+    def courses(self):
+        """The full course codes of the program."""
+        codes = self.table.codes
+        return [codes[section_id] for section_id in self.section_ids]
+
+    @property
+    def schedule(self):
+        """The combined schedule of all sections, as schedule dictionaries."""
+        schedules = self.table.schedules
+        return [slot for section_id in self.section_ids for slot in schedules[section_id]]
+
+    @property
+    def days(self):
+        """The set of day names the program meets on."""
+        schedules = self.table.schedules
+        return {slot["day"] for section_id in self.section_ids for slot in schedules[section_id]}
+
+    @property
+    def alternatives(self):
+        """The equivalent sections of the program's courses, as {course code: [alternative codes]}."""
+        if not self.alternative_ids:
+            return {}
+        codes = self.table.codes
+        return {codes[section_id]: [codes[other] for other in self.alternative_ids[section_id]]
+                for section_id in self.section_ids if section_id in self.alternative_ids}
+
+    @property
+    def variant_count(self):
+        """How many programs expand() yields."""
+        count = 1
+        if self.alternative_ids:
+            for section_id in self.section_ids:
+                count *= 1 + len(self.alternative_ids.get(section_id, ()))
+        return count
+
+    def expand(self):
+        """
+        Yields every program this one stands for, swapping in each combination of equivalent
+        sections. A program without alternatives yields a plain copy of itself.
+        """
+        alternative_ids = self.alternative_ids or {}
+        options = [(section_id,) + alternative_ids.get(section_id, ()) for section_id in self.section_ids]
+        for section_ids in product(*options):
+            # Equivalent sections meet at the same times, so every variant shares the occupancy mask
+            yield Program(self.table, section_ids, self.total_credits, self.day_mask, self.minutes,
+                          time_mask=self._time_mask)
+
+    @property
+    def total_days(self):
+        return self.day_mask.bit_count()
+
+    @property
+    def total_hours(self):
+        return self.minutes / 60.0
+
+    @property
+    def total_courses(self):
+        return len(self.section_ids)
+
+    @property
+    def time_mask(self):
+        """The weekly occupancy mask of all sections (see time_masks.schedule_to_mask)."""
+        if self._time_mask is None:
+            time_masks = self.table.time_masks
+            occupied = 0
+            for section_id in self.section_ids:
+                occupied |= time_masks[section_id]
+            self._time_mask = occupied
+        return self._time_mask
+
+    @property
+    def idle_minutes(self):
+        """Weekly minutes spent waiting between classes on the same day."""
+        return idle_minutes(self.time_mask)
+
+    @property
+    def earliest_start(self):
+        """The earliest time of day a class starts, in minutes after midnight."""
+        return earliest_start(self.time_mask)
+
+    @property
+    def latest_finish(self):
+        """The latest time of day a class ends, in minutes after midnight."""
+        return latest_finish(self.time_mask)
+
+    @property
+    def longest_day(self):
+        """Minutes from the first class to the end of the last one on the longest day."""
+        return longest_day(self.time_mask)
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if not isinstance(other, Program):
+            return NotImplemented
+        return (self.courses == other.courses and self.total_credits == other.total_credits
+                and self.day_mask == other.day_mask and self.minutes == other.minutes)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<Program: {' | '.join(self.courses)}>"
+
+
+class ProgramSet:
+    """
+    A sequence of programs stored column-wise: one tuple of section IDs per program and
+    array columns for credits, day masks and weekly minutes, all sharing one CourseTable.
+
+    Indexing and iteration hand out Program records built on the fly, so filters, sort
+    keys and printing work unchanged while millions of programs stay cheap to hold and
+    to pickle. The alternative sections of a collapsed search are stored once for all.
+    """
+
+    def __init__(self, programs=(), table=None):
+        """
+        Args:
+            programs (iterable, optional): Program records to store.
+            table (CourseTable, optional): The table the section IDs refer to. Taken from
+                the first stored program when not given.
+        """
+        self.table = table
+        self.alternative_ids = None
+        self.section_ids = []
+        self.credits = array("L")
+        self.day_masks = array("L")
+        self.minutes = array("L")
+        self.extend(programs)
+
+    def append(self, program):
+        """Stores a Program record."""
+        if self.table is None:
+            self.table = program.table
+        if self.alternative_ids is None:
+            self.alternative_ids = program.alternative_ids
+        self.section_ids.append(program.section_ids)
+        self.credits.append(program.total_credits)
+        self.day_masks.append(program.day_mask)
+        self.minutes.append(program.minutes)
+
+    def extend(self, programs):
+        """Stores every Program record of an iterable."""
+        for program in programs:
+            self.append(program)
+
+    def __len__(self):
+        return len(self.section_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Program(self.table, self.section_ids[index], self.credits[index], self.day_masks[index],
+                       self.minutes[index], self.alternative_ids)
+
+    def __iter__(self):
+        table = self.table
+        alternative_ids = self.alternative_ids
+        for row in zip(self.section_ids, self.credits, self.day_masks, self.minutes):
+            yield Program(table, *row, alternative_ids)
+
+    def __eq__(self, other):
+        # Compares like a list, so a ProgramSet equals a list of the same programs
+        if not isinstance(other, (ProgramSet, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
@@ -1,5 +1,13 @@
-#NOT IMPLEMENTED
+# src/requirements_model.py
+"""
+Requirement handling. compile_requirements turns the requirement dictionaries loaded from JSON
+into the RequirementPlan the program generator runs on. The candidate classes model richer
+requirement definitions and are not used by the generator yet.
+"""
 import abc  # For Abstract Base Classes
+import math
+
+from src.course_models import CourseTable
 
 class CourseCandidate(abc.ABC):
     """Abstract base class for course candidates in requirements."""
@@ -96,4 +104,218 @@ class Requirement:
         self.needed = needed
 
     def __repr__(self):
-        return f"<Requirement: {self.requirement_name} - Needed: {self.needed}, Candidates: {self.candidates}>"
\ No newline at end of file
+        return f"<Requirement: {self.requirement_name} - Needed: {self.needed}, Candidates: {self.candidates}>"
+
+
+# --- Requirement compiler ---
+
+class RequirementError(ValueError):
+    """Raised when a requirement definition cannot be compiled."""
+
+
+def parse_needed(needed):
+    """
+    Parses a 'needed' condition into the (min, max) number of courses it allows.
+
+    Args:
+        needed (str): Condition string (e.g., "=1", "<=2", ">=3").
+
+    Returns:
+        tuple: (min_count, max_count). max_count is infinity for '>=' and '>' conditions.
+
+    Raises:
+        RequirementError: If the condition is not an operator followed by a non-negative integer.
+    """
+    if not isinstance(needed, str):
+        raise RequirementError(f"Invalid condition: {needed!r}")
+    needed = needed.strip()
+    # Two-character operators are checked first so ">=2" is not read as "=2"
+    for op in (">=", "<=", ">", "<", "="):
+        if needed.startswith(op):
+            value_str = needed[len(op):].strip()
+            if not value_str.isdigit():
+                raise RequirementError(f"Invalid condition: {needed}")
+            value = int(value_str)
+            if op == ">=":
+                return value, float('inf')
+            if op == "<=":
+                return 0, value
+            if op == ">":
+                return value + 1, float('inf')
+            if op == "<":
+                return 0, value - 1
+            return value, value
+    raise RequirementError(f"Invalid condition: {needed}")
+
+
+class _Frozen:
+    """Base for plan objects: attributes are set once in __init__ and cannot be changed afterwards."""
+
+    __slots__ = ()
+
+    def _set(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        self._set(**state)
+
+
+class CompiledRequirement(_Frozen):
+    """
+    One requirement, ready for the search: candidates as section IDs of the plan's course table,
+    the same candidates as a bitset, and the bounds of its 'needed' condition.
+    positions[j] is where candidate j stood in the user's candidate list.
+    """
+
+    __slots__ = ("name", "needed", "min_count", "max_count", "candidate_codes", "candidate_ids", "mask", "positions")
+
+    def __init__(self, name, needed, candidate_codes, table, positions=None):
+        min_count, max_count = parse_needed(needed)
+        candidate_ids = tuple(table.ids[code] for code in candidate_codes)
+        mask = 0
+        for section_id in candidate_ids:
+            mask |= 1 << section_id
+        positions = tuple(range(len(candidate_ids))) if positions is None else tuple(positions)
+        self._set(name=name, needed=needed, min_count=min_count, max_count=max_count,
+                  candidate_codes=tuple(candidate_codes), candidate_ids=candidate_ids, mask=mask, positions=positions)
+
+    def combination_count(self):
+        """Returns how many candidate subsets satisfy the condition, ignoring conflicts and credits."""
+        n = len(self.candidate_ids)
+        return sum(math.comb(n, k) for k in range(self.min_count, min(self.max_count, n) + 1))
+
+    def __repr__(self):
+        return f"<CompiledRequirement: {self.name} - Needed: {self.needed}, Candidates: {len(self.candidate_ids)}>"
+
+
+class RequirementPlan(_Frozen):
+    """
+    The compiled requirements of a run over one CourseTable that holds every section they list.
+    Built by compile_requirements, in the user's order; order[k] is the user's index of the
+    requirement at position k, which differs from k once the plan has been ordered().
+    """
+
+    __slots__ = ("table", "requirements", "unknown_codes", "order")
+
+    def __init__(self, table, requirements, unknown_codes=(), order=None):
+        requirements = tuple(requirements)
+        order = tuple(range(len(requirements))) if order is None else tuple(order)
+        self._set(table=table, requirements=requirements, unknown_codes=tuple(unknown_codes), order=order)
+
+    def __len__(self):
+        return len(self.requirements)
+
+    def __iter__(self):
+        return iter(self.requirements)
+
+    def __getitem__(self, index):
+        return self.requirements[index]
+
+    def restricted(self, keep):
+        """
+        Returns a plan over the same table whose candidate lists only keep the section IDs
+        for which keep(section_id) is true.
+        """
+        requirements = []
+        for req in self.requirements:
+            kept = [j for j, section_id in enumerate(req.candidate_ids) if keep(section_id)]
+            requirements.append(CompiledRequirement(req.name, req.needed, [req.candidate_codes[j] for j in kept],
+                                                    self.table, [req.positions[j] for j in kept]))
+        return RequirementPlan(self.table, requirements, self.unknown_codes, self.order)
+
+    def ordered(self):
+        """
+        Returns the same requirements in most-constrained-first order, for the search.
+
+        Requirements with the fewest satisfying candidate subsets come first, since they cut
+        the tree earliest; ties go to the one whose candidates clash with more sections. Inside
+        a requirement, the candidates that clash with the most sections come first, then the
+        ones worth the most credits. The search produces the same programs either way, and
+        positions/order keep what is needed to list their courses in the user's order.
+        """
+        table = self.table
+        conflict_masks = table.conflict_masks
+        listed_mask = 0
+        for req in self.requirements:
+            for section_id in req.candidate_ids:
+                listed_mask |= 1 << section_id
+        clashes = {section_id: (conflict_masks[section_id] & listed_mask).bit_count()
+                   for req in self.requirements for section_id in req.candidate_ids}
+
+        def requirement_key(index):
+            req = self.requirements[index]
+            return req.combination_count(), -sum(clashes[section_id] for section_id in req.candidate_ids), index
+
+        new_order = sorted(range(len(self.requirements)), key=requirement_key)
+        requirements = []
+        for index in new_order:
+            req = self.requirements[index]
+            ids = req.candidate_ids
+            ranked = sorted(range(len(ids)), key=lambda j: (-clashes[ids[j]], -table.credits[ids[j]], j))
+            requirements.append(CompiledRequirement(req.name, req.needed, [req.candidate_codes[j] for j in ranked],
+                                                    table, [req.positions[j] for j in ranked]))
+        return RequirementPlan(table, requirements, self.unknown_codes, [self.order[index] for index in new_order])
+
+    def __repr__(self):
+        return f"<RequirementPlan: {len(self.requirements)} requirements, {len(self.table)} sections>"
+
+
+def compile_requirements(requirements, courses, conflict_graph=None):
+    """
+    Validates the requirement dictionaries and compiles them into a RequirementPlan.
+
+    Candidate codes missing from `courses` are dropped and reported in plan.unknown_codes;
+    a code listed twice in the same requirement is kept once.
+
+    Args:
+        requirements (list): Requirement dictionaries with 'needed' (e.g., "<=2"), 'candidates'
+            (list of full course codes) and optionally 'name' or 'requirement_name'.
+        courses (dict): CourseSection objects keyed by full course code.
+        conflict_graph (ConflictGraph, optional): The catalog's conflict graph, from which the
+            table takes its conflict bitsets instead of computing them.
+
+    Returns:
+        RequirementPlan: The compiled plan. Its table holds only the sections the requirements list.
+
+    Raises:
+        RequirementError: If a requirement is malformed or its condition cannot be parsed.
+    """
+    if not isinstance(requirements, (list, tuple)):
+        raise RequirementError("Requirements must be a list of requirement dictionaries.")
+
+    unknown_codes = []
+    known_lists = []
+    table_sections = {}
+    for index, req in enumerate(requirements):
+        if not isinstance(req, dict):
+            raise RequirementError(f"Requirement #{index + 1} is not a dictionary.")
+        name = req.get("name") or req.get("requirement_name") or f"#{index + 1}"
+        if "needed" not in req:
+            raise RequirementError(f"Requirement '{name}' has no 'needed' condition.")
+        candidates = req.get("candidates")
+        if not isinstance(candidates, list) or not all(isinstance(code, str) for code in candidates):
+            raise RequirementError(f"Requirement '{name}' needs a 'candidates' list of course codes.")
+        try:
+            parse_needed(req["needed"])
+        except RequirementError as e:
+            raise RequirementError(f"Requirement '{name}': {e}") from None
+
+        known = []
+        for code in dict.fromkeys(candidates):  # Drops repeated codes, keeps the order
+            if code in courses:
+                known.append(code)
+                table_sections.setdefault(code, courses[code])
+            elif code not in unknown_codes:
+                unknown_codes.append(code)
+        known_lists.append((name, req["needed"], known))
+
+    table = CourseTable(table_sections, conflict_graph)
+    compiled = [CompiledRequirement(name, needed, known, table) for name, needed, known in known_lists]
+    return RequirementPlan(table, compiled, unknown_codes)
@@ -0,0 +1,135 @@
+# src/search_checkpoint.py
+"""Saved progress of a generation run, so an interrupted run can resume where it stopped."""
+import os
+import pickle
+import time
+
+from src.program_set import ProgramSet
+
+# Bump whenever the saved frontier or program representation changes, so old checkpoints are ignored.
+CHECKPOINT_VERSION = 2
+
+
+class SearchCheckpoint:
+    """
+    The programs a run has produced so far and the search frontier still to explore, kept in
+    one append-only pickle file.
+
+    iter_programs records every program it yields and saves the frontier every `interval`
+    seconds and when it is cancelled. The file starts with a header naming the run; each save
+    appends one segment holding the programs recorded since the previous save and the current
+    frontier, so a save costs as much as the progress it adds. A later run with the same
+    identity loads the file, yields the saved programs again and continues from the last
+    frontier. The frontier is opaque here; the search decides what it holds.
+    """
+
+    def __init__(self, path, identity, interval=30.0):
+        """
+        Args:
+            path (str): The checkpoint file.
+            identity (dict): Everything the search result depends on (requirements, credits,
+                constraints, catalog, ...). A checkpoint is only resumed by a run with an equal identity.
+            interval (float, optional): Seconds between periodic saves.
+        """
+        self.path = path
+        self.identity = identity
+        self.interval = interval
+        self.programs = ProgramSet()  # The programs loaded from the file
+        self.frontier = None  # None until a checkpoint is loaded: the search starts from scratch
+        self._pending = ProgramSet()  # Programs recorded since the last save
+        self._table_saved = False  # Whether a segment of the file already holds the course table
+        self._file_started = False  # Whether the file holds this run's header, so saves append to it
+        self._last_save = time.monotonic()
+
+    def load(self):
+        """
+        Loads the saved progress if the file exists and matches this run. A segment cut short
+        by an interruption while saving is dropped, and the file is trimmed back to the last
+        complete one.
+
+        Returns:
+            bool: Whether there is progress to resume.
+        """
+        if not os.path.exists(self.path):
+            return False
+        programs = ProgramSet()
+        frontier = None
+        try:
+            with open(self.path, 'rb') as f:
+                header = pickle.load(f)
+                if header.get('version') != CHECKPOINT_VERSION or header.get('identity') != self.identity:
+                    return False
+                end = f.tell()
+                while True:
+                    try:
+                        segment = pickle.load(f)
+                    except Exception:
+                        # The end of the file, or a segment cut short by an interrupted save
+                        break
+                    _append_segment(programs, segment)
+                    frontier = segment['frontier']
+                    end = f.tell()
+            if end < os.path.getsize(self.path):
+                os.truncate(self.path, end)
+        except Exception as e:
+            print(f"Could not load checkpoint '{os.path.basename(self.path)}' ({e}). Starting over.")
+            return False
+        self._file_started = True
+        if frontier is None:
+            return False
+        self.programs = programs
+        self.frontier = frontier
+        self._table_saved = programs.table is not None
+        return True
+
+    def record(self, program):
+        """Adds a program the search has produced."""
+        self._pending.append(program)
+
+    def due(self):
+        """Whether the periodic save interval has passed."""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, frontier):
+        """
+        Appends the programs recorded since the last save and the frontier to the checkpoint
+        file, starting the file over with a header on the run's first save.
+        """
+        self._last_save = time.monotonic()
+        pending = self._pending
+        segment = {"frontier": frontier, "section_ids": pending.section_ids, "credits": pending.credits,
+                   "day_masks": pending.day_masks, "minutes": pending.minutes}
+        if not self._table_saved and pending.table is not None:
+            # The table and the alternative sections are the same for the whole run, so one segment keeps them
+            segment["table"] = pending.table
+            segment["alternative_ids"] = pending.alternative_ids
+        try:
+            with open(self.path, 'ab' if self._file_started else 'wb') as f:
+                if not self._file_started:
+                    pickle.dump({"version": CHECKPOINT_VERSION, "identity": self.identity}, f)
+                pickle.dump(segment, f)
+        except Exception as e:
+            print(f"Error saving checkpoint to '{self.path}': {e}")
+            return
+        self._file_started = True
+        self._table_saved = self._table_saved or "table" in segment
+        self._pending = ProgramSet()
+
+    def clear(self):
+        """Deletes the checkpoint file, once the run it belongs to has finished."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._file_started = False
+
+
+def _append_segment(programs, segment):
+    """Adds the programs of a saved segment to a ProgramSet."""
+    if "table" in segment:
+        programs.table = segment["table"]
+        programs.alternative_ids = segment["alternative_ids"]
+    programs.section_ids.extend(segment["section_ids"])
+    programs.credits.extend(segment["credits"])
+    programs.day_masks.extend(segment["day_masks"])
+    programs.minutes.extend(segment["minutes"])
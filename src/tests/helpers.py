@@ -0,0 +1,13 @@
+from src.course_models import CourseSection
+
+
+def make_section(full_course_code, ects_credits=6, schedule=None):
+    """Builds a CourseSection with only the fields the generator uses, meeting Monday 09.00-10.00 by default."""
+    if schedule is None:
+        schedule = [{"day": "Pazartesi", "interval": "09.00-10.00"}]
+    course_id, section_no = full_course_code.split(".")
+    subject_code, course_number = course_id.split(" ")
+    return CourseSection(full_course_code=full_course_code, ects_credits=ects_credits, schedule=schedule,
+                         section_no=section_no, course_name=course_id, course_id=course_id,
+                         subject_code=subject_code, course_number=course_number, faculty=None,
+                         instructor_full_name=None, corequisites=[], prerequisites=None, description=None)
@@ -0,0 +1,39 @@
+from src.conflict_graph import ConflictGraph
+from src.course_models import CourseTable
+from src.tests.helpers import make_section
+
+
+def make_catalog():
+    """CS 101.A clashes with HIST 200.A and MATH 102.A, which do not clash with each other."""
+    sections = [
+        make_section("CS 101.A", 6, [{"day": "Pazartesi", "interval": "09.00-11.00"}]),
+        make_section("HIST 200.A", 4, [{"day": "Pazartesi", "interval": "08.30-09.30"}]),
+        make_section("MATH 102.A", 8, [{"day": "Pazartesi", "interval": "10.30-11.30"}]),
+        make_section("PHYS 101.A", 6, [{"day": "Salı", "interval": "09.00-11.00"}]),
+    ]
+    return {section.full_course_code: section for section in sections}
+
+
+def test_conflict_graph_matches_pairwise_mask_overlaps():
+    catalog = make_catalog()
+    graph = ConflictGraph.from_courses(catalog)
+
+    for code, section in catalog.items():
+        expected = [other for other, other_section in catalog.items()
+                    if other != code and section.time_mask & other_section.time_mask]
+        assert graph.clashes(code) == expected
+    assert graph.clashes("CS 101.A") == ["HIST 200.A", "MATH 102.A"]
+    assert graph.clashes("PHYS 101.A") == []
+
+
+def test_course_table_renumbers_the_catalog_graph():
+    """A table over some of the sections takes its conflict bitsets from the catalog graph."""
+    catalog = make_catalog()
+    graph = ConflictGraph.from_courses(catalog)
+    subset = {code: catalog[code] for code in ("MATH 102.A", "PHYS 101.A", "CS 101.A")}
+
+    table = CourseTable(subset, graph)
+
+    assert table.conflict_masks == CourseTable(subset).conflict_masks
+    assert table.conflict_masks[table.ids["CS 101.A"]] == 1 << table.ids["MATH 102.A"]
+    assert table.conflict_masks[table.ids["PHYS 101.A"]] == 0
@@ -3,12 +3,14 @@ import pandas as pd
 import json
 import os
 import hashlib
+import threading
 from pathlib import Path
 
 
 # Import the code we are testing
 from src.main import run_program_generation
 from src.config import Config
+from src.localization import LocalizationManager
 
 # --- Test Data Fixtures ---
 # These fixtures just prepare our fake data.
@@ -121,7 +123,7 @@ def test_run_generation_cache_miss(test_environment):
     config.input['cache']['enabled'] = True  # Enable caching
 
     # ACT: Run the main function
-    summarized_programs, log_output, _ = run_program_generation(config)
+    summarized_programs, log_output, _, _ = run_program_generation(config)
 
     # ASSERT: Check the results
     assert "Generating possible programs..." in log_output
@@ -149,10 +151,92 @@ def test_run_generation_cache_hit(test_environment):
 
     # ACT - Second Run (should hit the cache)
     print("Second run (testing cache hit)...")
-    summarized_programs, log_output, _ = run_program_generation(config)
+    summarized_programs, log_output, _, _ = run_program_generation(config)
 
     # ASSERT
     assert "Generating possible programs..." not in log_output  # Should NOT generate again
     assert "Cache is valid. Loading programs from cache." in log_output
     assert "Total programs found: 2" in log_output
-    assert len(summarized_programs) == 2
\ No newline at end of file
+    assert len(summarized_programs) == 2
+
+
+def test_run_generation_stopped_early_returns_a_partial_result_without_caching_it(test_environment):
+    """
+    A search stopped before it finishes lists what it found, flags the result as partial and
+    leaves the cache alone; the next run finishes the search and fills the cache.
+    """
+    config = test_environment
+    config.loc = LocalizationManager()
+    config.input['cache']['enabled'] = True
+    stop_event = threading.Event()
+    stop_event.set()
+
+    summarized_programs, log_output, _, partial = run_program_generation(config, stop_event=stop_event)
+
+    assert partial
+    assert "partial result" in log_output
+    assert len(summarized_programs) < 2
+    assert not os.path.exists(config.input['cache']['filepath'])
+
+    summarized_programs, log_output, _, partial = run_program_generation(config)
+
+    assert not partial
+    assert "Found 2 possible programs" in log_output
+    assert "Estimated search size" not in log_output  # Nothing reads the estimate without a progress callback
+    assert len(summarized_programs) == 2
+    assert os.path.exists(config.input['cache']['filepath'])
+
+
+def test_run_generation_keeps_only_the_top_programs_with_the_default_cache_settings(test_environment):
+    """
+    With a sort key and a result limit the search keeps just the top programs, even though the
+    default Config saves to the program cache; the cache only ever holds complete sets.
+    """
+    config = test_environment
+    config.loc = LocalizationManager()
+    config.display_params['limit_results'] = 1
+    assert config.output['cache']['enabled']
+
+    summarized_programs, log_output, _, partial = run_program_generation(config)
+
+    assert not partial
+    assert "Kept the top 1 programs by 'total_courses'" in log_output
+    assert "programs examined" in log_output
+    assert "program cache was not updated" in log_output
+    assert len(summarized_programs) == 1
+    assert not os.path.exists(config.input['cache']['filepath'])
+
+
+def test_run_generation_searches_for_the_pareto_front_with_the_default_cache_settings(test_environment):
+    """The Pareto front drives the search with the default Config as well, as the GUI tooltip promises."""
+    config = test_environment
+    config.loc = LocalizationManager()
+    config.display_params['pareto_metrics'] = ["total_days", "total_hours", "idle_minutes"]
+
+    summarized_programs, log_output, _, partial = run_program_generation(config)
+
+    assert not partial
+    assert "Pareto-optimal programs by total_days, total_hours, idle_minutes (" in log_output
+    assert "program cache was not updated" in log_output
+    assert 1 <= len(summarized_programs) <= 2
+    assert not os.path.exists(config.input['cache']['filepath'])
+
+
+def test_run_generation_stops_sampling_on_the_stop_event(test_environment):
+    """Stop and Show also ends a random sample, which is then marked as partial."""
+    config = test_environment
+    config.loc = LocalizationManager()
+    config.generation_params['sample_size'] = 5
+    stop_event = threading.Event()
+    stop_event.set()
+
+    summarized_programs, log_output, _, partial = run_program_generation(config, stop_event=stop_event)
+
+    assert partial
+    assert "Sampling was stopped before it finished" in log_output
+    assert len(summarized_programs) < 2
+
+    summarized_programs, log_output, _, partial = run_program_generation(config)
+
+    assert not partial
+    assert len(summarized_programs) == 2
@@ -1,63 +1,409 @@
-from src.program_generator import check_satisfied
+from src.program_generator import (count_programs, estimate_search, generate_programs, iter_programs, ParetoFront,
+                                   sample_programs, TopKPrograms)
+from src.tests.helpers import make_section
+from src.program_set import ProgramSet
+from src.search_checkpoint import SearchCheckpoint
 import pytest
+import os
+import sys
+import threading
 
 # Test functions MUST start with the word "test_"
 # The function name should describe what it's testing.
 
-def test_check_satisfied_equal_condition():
+# --- generate_programs tests on a small in-memory catalog ---
+
+@pytest.fixture
+def small_catalog():
+    """Four courses: CS 101.A clashes with HIST 200.A, everything else is free of conflicts."""
+    sections = [
+        make_section("CS 101.A", 6, [{"day": "Pazartesi", "interval": "09.00-10.00"}]),
+        make_section("CS 101.B", 6, [{"day": "Salı", "interval": "09.00-10.00"}]),
+        make_section("HIST 200.A", 4, [{"day": "Pazartesi", "interval": "09.30-10.30"}]),
+        make_section("MATH 102.A", 8, [{"day": "Çarşamba", "interval": "11.00-12.00"}]),
+    ]
+    return {section.full_course_code: section for section in sections}
+
+
+@pytest.fixture
+def small_requirements():
+    return [
+        {"name": "CS", "needed": "=1", "candidates": ["CS 101.A", "CS 101.B"]},
+        {"name": "Electives", "needed": "<=2", "candidates": ["HIST 200.A", "MATH 102.A"]},
+    ]
+
+
+def program_course_sets(programs):
+    return sorted(sorted(program["courses"]) for program in programs)
+
+
+def test_generate_programs_respects_credit_bounds(small_catalog, small_requirements):
+    """
+    Only programs inside [min_credit, max_credit] are produced, and the credit pruning
+    must not lose any of them.
+    """
+    programs = generate_programs(small_requirements, small_catalog, 14, 14, None)
+
+    assert program_course_sets(programs) == [["CS 101.A", "MATH 102.A"], ["CS 101.B", "MATH 102.A"]]
+    assert all(program["total_credits"] == 14 for program in programs)
+
+
+def test_generate_programs_unreachable_minimum_returns_nothing(small_catalog, small_requirements):
+    """
+    A minimum above anything the requirements can provide yields no programs.
     """
-    Tests the '=' condition in check_satisfied.
-    This is a "happy path" test, where everything works as expected.
+    assert generate_programs(small_requirements, small_catalog, 30, 42, None) == []
+
+
+def test_generate_programs_backends_match(small_catalog, small_requirements):
     """
-    # ARRANGE: Set up our inputs
-    needed_condition = "=2"
-    passing_count = 2
-    failing_count = 3
+    The legacy and bitmask conflict backends produce the same programs.
+    """
+    legacy = generate_programs(small_requirements, small_catalog, 0, 42, None, conflict_backend="legacy")
+    bitmask = generate_programs(small_requirements, small_catalog, 0, 42, None, conflict_backend="bitmask")
 
-    # ACT: Call the function with our inputs
-    pass_result = check_satisfied(needed_condition, passing_count)
-    fail_result = check_satisfied(needed_condition, failing_count)
+    assert program_course_sets(legacy) == program_course_sets(bitmask)
+    assert ["CS 101.A", "HIST 200.A"] not in program_course_sets(bitmask)
 
-    # ASSERT: Check if the results are what we expect
-    assert pass_result is True
-    assert fail_result is False
 
-def test_check_satisfied_less_than_or_equal_condition():
+def test_generate_programs_at_least_condition_is_open_ended(small_catalog, small_requirements):
     """
-    Tests the '<=' condition in check_satisfied.
+    '>=1' allows taking both electives; it used to be read as '=1'.
     """
-    # ARRANGE
-    needed_condition = "<=3"
+    small_requirements[1]["needed"] = ">=1"
+    programs = generate_programs(small_requirements, small_catalog, 0, 42, None)
+
+    assert program_course_sets(programs) == [
+        ["CS 101.A", "MATH 102.A"],
+        ["CS 101.B", "HIST 200.A"],
+        ["CS 101.B", "HIST 200.A", "MATH 102.A"],
+        ["CS 101.B", "MATH 102.A"],
+    ]
 
-    # ACT & ASSERT
-    assert check_satisfied(needed_condition, 2) is True  # 2 <= 3
-    assert check_satisfied(needed_condition, 3) is True  # 3 <= 3 (edge case)
-    assert check_satisfied(needed_condition, 4) is False # 4 is not <= 3
 
-def test_check_satisfied_greater_than_condition():
+def test_generate_programs_unsatisfiable_count_returns_nothing(small_catalog, small_requirements):
     """
-    Tests the '>' condition in check_satisfied.
+    A requirement that needs more courses than it has candidates prunes everything.
     """
-    # ARRANGE
-    needed_condition = ">1"
+    small_requirements[1]["needed"] = "=3"
+    assert generate_programs(small_requirements, small_catalog, 0, 42, None) == []
 
-    # ACT & ASSERT
-    assert check_satisfied(needed_condition, 2) is True  # 2 > 1
-    assert check_satisfied(needed_condition, 1) is False # 1 is not > 1 (edge case)
-    assert check_satisfied(needed_condition, 0) is False # 0 is not > 1
+    small_requirements[1]["needed"] = "<0"
+    assert generate_programs(small_requirements, small_catalog, 0, 42, None) == []
 
-def test_check_satisfied_invalid_condition_raises_error():
+
+def test_iter_programs_streams_the_same_programs(small_catalog, small_requirements):
     """
-    Tests that our function correctly fails when given bad input.
-    This is a "sad path" test.
+    iter_programs yields lazily, and in the same order generate_programs returns.
     """
-    # ARRANGE
-    bad_condition = "abc2" # This isn't a valid operator
-    count = 2
+    stream = iter_programs(small_requirements, small_catalog, 0, 42)
+    first = next(stream)
+
+    assert [first] + list(stream) == generate_programs(small_requirements, small_catalog, 0, 42, None)
+
+
+def test_iter_programs_enforces_search_constraints(small_catalog, small_requirements):
+    """
+    Search constraints give the same programs as generating everything and filtering afterwards.
+    """
+    constraints = {
+        "exclude_courses": (), "include_courses": (), "must_courses": ("MATH 102.A",),
+        "required_days": (), "forbidden_days": ("Salı",), "day_num_condition": ("<=", 2),
+    }
+    programs = list(iter_programs(small_requirements, small_catalog, 0, 42, constraints=constraints))
+
+    # CS 101.B meets on Tuesday, and HIST 200.A would make CS 101.A clash
+    assert program_course_sets(programs) == [["CS 101.A", "MATH 102.A"]]
+
+
+def test_iter_programs_unavailable_must_course_returns_nothing(small_catalog, small_requirements):
+    constraints = {"must_courses": ("PHYS 101.A",)}
+    assert list(iter_programs(small_requirements, small_catalog, 0, 42, constraints=constraints)) == []
+
+
+@pytest.mark.parametrize("sort_key, reverse", [
+    ("total_days", False), ("total_credits", False), ("total_hours", True), ("total_courses", True),
+    ("latest_finish", False), ("longest_day", False),
+])
+def test_top_k_programs_matches_sorted_slice(small_catalog, small_requirements, sort_key, reverse):
+    """
+    The bounded heap (and the branches it cuts) keeps exactly what sorting everything and slicing keeps.
+    """
+    all_programs = generate_programs(small_requirements, small_catalog, 0, 42, None)
+    expected = sorted(all_programs, key=lambda program: program[sort_key], reverse=reverse)[:2]
+
+    top_k = TopKPrograms(2, sort_key, reverse)
+    for program in iter_programs(small_requirements, small_catalog, 0, 42, bound=top_k):
+        top_k.offer(program)
+
+    assert [program["courses"] for program in top_k.results()] == [program["courses"] for program in expected]
+
+
+def test_generate_programs_parallel_matches_sequential(small_catalog, small_requirements):
+    """Worker processes return the same programs as the sequential search, in the order their subtrees finish."""
+    sequential = generate_programs(small_requirements, small_catalog, 0, 42, None)
+    parallel = generate_programs(small_requirements, small_catalog, 0, 42, None, workers=2)
+
+    assert len(parallel) == len(sequential)
+    assert sorted(program["courses"] for program in parallel) == sorted(program["courses"] for program in sequential)
+
+
+def test_parallel_search_reports_every_node_once(small_catalog, small_requirements):
+    sequential, parallel = [], []
+    list(iter_programs(small_requirements, small_catalog, 0, 42, progress=sequential.append))
+    list(iter_programs(small_requirements, small_catalog, 0, 42, workers=2, progress=parallel.append))
+
+    assert sum(parallel) == sum(sequential)
+
+
+def test_generate_programs_counts_a_section_for_every_requirement_listing_it(small_catalog):
+    """
+    CS 101.A is listed by both requirements, so it counts toward both: on its own it satisfies
+    them, and each course set is produced once. CS 101.A + HIST 200.A clash.
+    """
+    requirements = [
+        {"name": "CS", "needed": "=1", "candidates": ["CS 101.A", "CS 101.B"]},
+        {"name": "Monday", "needed": "=1", "candidates": ["CS 101.A", "HIST 200.A"]},
+    ]
+    programs = generate_programs(requirements, small_catalog, 0, 42, None)
+
+    assert program_course_sets(programs) == [["CS 101.A"], ["CS 101.B", "HIST 200.A"]]
+
+
+def test_generate_programs_shared_candidates_give_each_course_set_once(small_catalog):
+    """Overlapping requirements reach a course set through one path only, in either search order."""
+    requirements = [
+        {"name": "Core", "needed": ">=1", "candidates": ["CS 101.B", "MATH 102.A"]},
+        {"name": "Electives", "needed": "<=2", "candidates": ["MATH 102.A", "HIST 200.A", "CS 101.B"]},
+    ]
+    for reorder in (False, True):
+        programs = generate_programs(requirements, small_catalog, 0, 42, None, reorder=reorder)
+        course_sets = program_course_sets(programs)
+
+        assert len(course_sets) == len(set(map(tuple, course_sets)))
+        assert course_sets == [["CS 101.B"], ["CS 101.B", "HIST 200.A"],
+                               ["CS 101.B", "MATH 102.A"], ["HIST 200.A", "MATH 102.A"], ["MATH 102.A"]]
+
+
+def test_reordered_search_produces_the_same_programs(small_catalog):
+    """
+    Searching the most constrained requirement first changes the order programs arrive in,
+    but not which programs are found or the order their courses are listed in.
+    """
+    requirements = [
+        {"name": "Electives", "needed": "<=2", "candidates": ["HIST 200.A", "MATH 102.A"]},
+        {"name": "CS", "needed": "=1", "candidates": ["CS 101.A", "CS 101.B"]},
+    ]
+    in_order = generate_programs(requirements, small_catalog, 0, 42, None, reorder=False)
+    reordered = generate_programs(requirements, small_catalog, 0, 42, None, reorder=True)
+
+    assert sorted(program["courses"] for program in reordered) == sorted(program["courses"] for program in in_order)
+    assert all(program["courses"][-1].startswith("CS") for program in reordered)
+
+
+def test_generate_programs_never_takes_two_sections_of_a_course(small_catalog):
+    """CS 101.A and CS 101.B do not clash, but they are sections of the same course."""
+    requirements = [{"name": "Any", "needed": "<=4", "candidates": list(small_catalog)}]
+    programs = generate_programs(requirements, small_catalog, 0, 42, None)
+
+    assert programs
+    assert not any({"CS 101.A", "CS 101.B"} <= set(program["courses"]) for program in programs)
+
+
+def test_collapsed_search_lists_same_time_sections_as_alternatives(small_catalog, small_requirements):
+    """CS 101.C meets when CS 101.B does, so it is searched once and expanded back afterwards."""
+    catalog = dict(small_catalog)
+    catalog["CS 101.C"] = make_section("CS 101.C", 6, [{"day": "Salı", "interval": "09.00-10.00"}])
+    requirements = [dict(small_requirements[0], candidates=["CS 101.A", "CS 101.B", "CS 101.C"]),
+                    small_requirements[1]]
+    full = generate_programs(requirements, catalog, 0, 42, None)
+    collapsed = generate_programs(requirements, catalog, 0, 42, None, collapse_equivalent=True)
+
+    assert len(collapsed) < len(full)
+    assert all(program["alternatives"] == {"CS 101.B": ["CS 101.C"]}
+               for program in collapsed if "CS 101.B" in program["courses"])
+    expanded = [variant for program in collapsed for variant in program.expand()]
+    assert program_course_sets(expanded) == program_course_sets(full)
+    assert sum(program.variant_count for program in collapsed) == len(full)
+
+
+@pytest.mark.parametrize("constraints", [
+    None,
+    {"must_courses": ("MATH 102.A",)},
+    {"include_courses": ("HIST 200.A", "CS 101.B"), "day_num_condition": ("<=", 2)},
+])
+def test_count_programs_matches_enumeration(small_catalog, small_requirements, constraints):
+    """Counting agrees with listing, also when same-time sections are counted as one class."""
+    catalog = dict(small_catalog)
+    catalog["CS 101.C"] = make_section("CS 101.C", 6, [{"day": "Salı", "interval": "09.00-10.00"}])
+    requirements = [dict(small_requirements[0], candidates=["CS 101.A", "CS 101.B", "CS 101.C"]),
+                    small_requirements[1]]
+
+    expected = len(list(iter_programs(requirements, catalog, 0, 42, constraints=constraints)))
+
+    assert expected > 0
+    assert count_programs(requirements, catalog, 0, 42, constraints=constraints) == expected
+    collapsed = len(list(iter_programs(requirements, catalog, 0, 42, constraints=constraints,
+                                       collapse_equivalent=True)))
+    assert count_programs(requirements, catalog, 0, 42, constraints=constraints, collapse_equivalent=True) == collapsed
+
+
+def test_search_engines_produce_the_same_stream(small_catalog, small_requirements):
+    constraints = {"include_courses": ("HIST 200.A", "MATH 102.A")}
+    recursive = list(iter_programs(small_requirements, small_catalog, 0, 42, constraints=constraints,
+                                   engine="recursive"))
+    iterative = list(iter_programs(small_requirements, small_catalog, 0, 42, constraints=constraints,
+                                   engine="iterative"))
+
+    assert recursive
+    assert [program["courses"] for program in iterative] == [program["courses"] for program in recursive]
+
+
+def test_iterative_engine_handles_more_candidates_than_the_recursion_limit():
+    catalog = {}
+    for i in range(sys.getrecursionlimit() + 200):
+        code = f"GEN {i}.A"
+        catalog[code] = make_section(code, 6, [{"day": "Pazartesi", "interval": "09.00-10.00"}])
+    requirements = [{"name": "Any", "needed": "=1", "candidates": list(catalog)}]
+
+    assert len(generate_programs(requirements, catalog, 0, 42, None)) == len(catalog)
+
+
+def many_candidates_requirements():
+    """More candidates than the recursion limit under one requirement: any one of them, or none."""
+    catalog = {}
+    for i in range(sys.getrecursionlimit() + 200):
+        code = f"GEN {i}.A"
+        catalog[code] = make_section(code, 6, [{"day": "Pazartesi", "interval": "09.00-10.00"}])
+    return catalog, [{"name": "Any", "needed": "<=1", "candidates": list(catalog)}]
+
+
+def test_count_programs_handles_more_candidates_than_the_recursion_limit():
+    catalog, requirements = many_candidates_requirements()
+
+    assert count_programs(requirements, catalog, 0, 42) == len(catalog) + 1
+
+
+def test_sample_programs_handles_more_candidates_than_the_recursion_limit():
+    catalog, requirements = many_candidates_requirements()
+
+    sample = sample_programs(requirements, catalog, 0, 42, 20, seed=1)
+
+    assert len(sample) == 20
+    assert len({tuple(program["courses"]) for program in sample}) == 20
+
+
+def test_cancelled_run_resumes_from_its_checkpoint(small_catalog, small_requirements, tmp_path):
+    path = str(tmp_path / "checkpoint.pkl")
+    full = [program["courses"] for program in iter_programs(small_requirements, small_catalog, 0, 42)]
+
+    cancel_event = threading.Event()
+    first = SearchCheckpoint(path, {"run": 1})
+    for count, program in enumerate(iter_programs(small_requirements, small_catalog, 0, 42, cancel_event,
+                                                  checkpoint=first), 1):
+        if count == 2:
+            cancel_event.set()
+
+    resumed = SearchCheckpoint(path, {"run": 1})
+    assert resumed.load()
+    assert len(resumed.programs) < len(full)
+    programs = [program["courses"] for program in iter_programs(small_requirements, small_catalog, 0, 42,
+                                                                checkpoint=resumed)]
+
+    assert programs == full
+    assert not SearchCheckpoint(path, {"run": 2}).load()
+
+
+def test_checkpoint_drops_a_save_cut_short_and_still_resumes(small_catalog, small_requirements, tmp_path):
+    path = str(tmp_path / "checkpoint.pkl")
+    full = [program["courses"] for program in iter_programs(small_requirements, small_catalog, 0, 42)]
+
+    cancel_event = threading.Event()
+    first = SearchCheckpoint(path, {"run": 1})
+    for count, program in enumerate(iter_programs(small_requirements, small_catalog, 0, 42, cancel_event,
+                                                  checkpoint=first), 1):
+        if count == 2:
+            cancel_event.set()
+    intact_size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(b"\x80\x04\x95 half a segment")
+
+    resumed = SearchCheckpoint(path, {"run": 1})
+    assert resumed.load()
+    assert os.path.getsize(path) == intact_size
+    programs = [program["courses"] for program in iter_programs(small_requirements, small_catalog, 0, 42,
+                                                                checkpoint=resumed)]
+
+    assert programs == full
+
+
+def test_estimate_search_tracks_the_nodes_and_programs_of_the_search(small_catalog, small_requirements):
+    visited = []
+    programs = list(iter_programs(small_requirements, small_catalog, 0, 42, progress=visited.append))
+    estimate = estimate_search(small_requirements, small_catalog, 0, 42, probes=2000, seed=0)
+
+    assert estimate.nodes == pytest.approx(sum(visited), rel=0.2)
+    assert estimate.programs == pytest.approx(len(programs), rel=0.2)
+
+
+@pytest.mark.parametrize("constraints", [None, {"day_num_condition": ("<=", 2)}])
+def test_sample_programs_draws_distinct_valid_programs_repeatably(small_catalog, small_requirements, constraints):
+    valid = program_course_sets(iter_programs(small_requirements, small_catalog, 0, 42, constraints=constraints))
+    sample = sample_programs(small_requirements, small_catalog, 0, 42, 2, seed=7, constraints=constraints)
+    again = sample_programs(small_requirements, small_catalog, 0, 42, 2, seed=7, constraints=constraints)
+
+    courses = [sorted(program["courses"]) for program in sample]
+    assert len(courses) == 2 and courses[0] != courses[1]
+    assert all(program_courses in valid for program_courses in courses)
+    assert [program["courses"] for program in again] == [program["courses"] for program in sample]
+
+
+def test_sample_programs_returns_everything_when_asked_for_more(small_catalog, small_requirements):
+    sample = sample_programs(small_requirements, small_catalog, 0, 42, 100, seed=1)
+
+    assert program_course_sets(sample) == program_course_sets(iter_programs(small_requirements, small_catalog, 0, 42))
+
+
+def test_day_span_metrics_follow_the_schedule(small_catalog, small_requirements):
+    """The metrics read from occupancy masks match the class times, for searched and stored programs."""
+    metrics = ("idle_minutes", "earliest_start", "latest_finish", "longest_day")
+    programs = list(iter_programs(small_requirements, small_catalog, 0, 42, workers=1))
+    assert programs
+    for program in programs:
+        by_day = {}
+        for slot in program["schedule"]:
+            start, end = (int(hours) * 60 + int(minutes) for hours, minutes in
+                          (time.split(".") for time in slot["interval"].split("-")))
+            by_day.setdefault(slot["day"], []).append((start, end))
+        spans = [(min(start for start, _ in slots), max(end for _, end in slots), slots) for slots in by_day.values()]
+        expected = (sum(last - first - sum(end - start for start, end in slots) for first, last, slots in spans),
+                    min(first for first, _, _ in spans), max(last for _, last, _ in spans),
+                    max(last - first for first, last, _ in spans))
+
+        stored = ProgramSet([program])[0]
+        for source in (program, stored):
+            assert tuple(source[metric] for metric in metrics) == expected
+
+
+def test_pareto_front_search_keeps_exactly_the_undominated_programs(small_catalog):
+    catalog = dict(small_catalog)
+    for section in (make_section("ART 300.A", 4, [{"day": "Pazartesi", "interval": "13.00-14.00"}]),
+                    make_section("ART 300.B", 4, [{"day": "Çarşamba", "interval": "12.00-13.00"}])):
+        catalog[section.full_course_code] = section
+    requirements = [
+        {"name": "CS", "needed": "=1", "candidates": ["CS 101.A", "CS 101.B"]},
+        {"name": "Electives", "needed": ">=1", "candidates": ["HIST 200.A", "MATH 102.A", "ART 300.A", "ART 300.B"]},
+    ]
+    metrics = ("total_days", "total_hours", "idle_minutes")
+    everything = list(iter_programs(requirements, catalog, 0, 42))
+    values = [tuple(program[metric] for metric in metrics) for program in everything]
+    undominated = [program for program, program_values in zip(everything, values)
+                   if not any(other != program_values and all(a <= b for a, b in zip(other, program_values))
+                              for other in values)]
+
+    front = ParetoFront(metrics)
+    for program in iter_programs(requirements, catalog, 0, 42, bound=front):
+        front.offer(program)
 
-    # ACT & ASSERT
-    # We expect a ValueError to happen. pytest helps us check for this.
-    # The 'with' block says "I expect the code inside here to crash with a ValueError".
-    # If it does, the test passes. If it doesn't crash, the test fails!
-    with pytest.raises(ValueError):
-        check_satisfied(bad_condition, count)
\ No newline at end of file
+    assert any(program["idle_minutes"] for program in everything)
+    assert program_course_sets(front.results()) == program_course_sets(undominated)
@@ -1,36 +1,12 @@
 import pytest
-from src.program_generator import check_satisfied, time_to_minutes
+from src.program_generator import CONFLICT_BACKENDS
+from src.time_masks import time_to_minutes
+from src.course_models import CourseTable
+from src.tests.helpers import make_section
 # The @pytest.mark.parametrize decorator lets us define a list of inputs
 # and expected outputs for a single test function.
 # It's incredibly efficient for testing functions with clear input/output patterns.
 
-@pytest.mark.parametrize("needed, count, expected", [
-    # Test cases are defined as tuples: (input1, input2, expected_output)
-    # --- Equality ---
-    ("=2", 2, True),
-    ("=2", 1, False),
-    # --- Less than or equal to ---
-    ("<=3", 3, True),
-    ("<=3", 2, True),
-    ("<=3", 4, False),
-    # --- Greater than or equal to ---
-    (">=1", 1, True),
-    (">=1", 2, True),
-    (">=1", 0, False),
-    # --- Less than ---
-    ("<2", 1, True),
-    ("<2", 2, False),
-    # --- Greater than ---
-    (">0", 1, True),
-    (">0", 0, False),
-])
-
-def test_check_satisfied_with_various_conditions(needed, count, expected):
-    """
-    A single, parameterized test that covers all conditions for check_satisfied.
-    """
-    assert check_satisfied(needed, count) is expected
-
 @pytest.mark.parametrize("time_str, expected_minutes", [
     ("09.30", 570),
     ("12.00", 720),
@@ -43,3 +19,23 @@ def test_time_to_minutes(time_str, expected_minutes):
     """
     assert time_to_minutes(time_str) == expected_minutes
 
+
+
+@pytest.mark.parametrize("first_slot, second_slot, expected_conflict", [
+    ({"day": "Pazartesi", "interval": "09.00-10.00"}, {"day": "Pazartesi", "interval": "09.30-10.30"}, True),
+    ({"day": "Pazartesi", "interval": "09.00-10.00"}, {"day": "Pazartesi", "interval": "10.00-11.00"}, False),  # Touching
+    ({"day": "Pazartesi", "interval": "09.00-10.00"}, {"day": "Salı", "interval": "09.00-10.00"}, False),
+    ({"day": "Cuma", "interval": "08.40 - 11.30"}, {"day": "Cuma", "interval": "11.20 - 12.30"}, True),
+])
+def test_conflict_backends_agree(first_slot, second_slot, expected_conflict):
+    """
+    The bitmask and graph backends must report exactly the conflicts the legacy string comparison reports.
+    """
+    first = make_section("A 1.A", 6, [first_slot])
+    second = make_section("B 1.A", 6, [second_slot])
+
+    table = CourseTable({"A 1.A": first, "B 1.A": second})
+
+    for backend in CONFLICT_BACKENDS.values():
+        occupied = backend.add(backend.empty(), table, table.ids["A 1.A"])
+        assert backend.conflicts(occupied, table, table.ids["B 1.A"]) is expected_conflict
@@ -0,0 +1,100 @@
+import pytest
+
+from src.requirements_model import compile_requirements, parse_needed, RequirementError
+from src.tests.helpers import make_section
+
+
+@pytest.fixture
+def courses():
+    return {code: make_section(code) for code in ["CS 101.A", "CS 101.B", "MATH 102.A"]}
+
+
+@pytest.mark.parametrize("needed, expected", [
+    ("=1", (1, 1)),
+    ("<=2", (0, 2)),
+    (">=2", (2, float('inf'))),
+    ("<3", (0, 2)),
+    (">0", (1, float('inf'))),
+])
+def test_parse_needed_bounds(needed, expected):
+    assert parse_needed(needed) == expected
+
+
+@pytest.mark.parametrize("needed, count, expected", [
+    ("=2", 2, True),
+    ("=2", 1, False),
+    ("<=3", 3, True),
+    ("<=3", 2, True),
+    ("<=3", 4, False),
+    (">=1", 1, True),
+    (">=1", 2, True),
+    (">=1", 0, False),
+    ("<2", 1, True),
+    ("<2", 2, False),
+    (">0", 1, True),
+    (">0", 0, False),
+])
+def test_parse_needed_bounds_admit_exactly_the_counts_meeting_the_condition(needed, count, expected):
+    min_count, max_count = parse_needed(needed)
+    assert (min_count <= count <= max_count) is expected
+
+
+@pytest.mark.parametrize("needed", ["abc2", "=", "<=x", "=-1", 2])
+def test_parse_needed_rejects_invalid_conditions(needed):
+    with pytest.raises(RequirementError):
+        parse_needed(needed)
+
+
+def test_compile_requirements_resolves_candidates(courses):
+    """
+    Candidates become section IDs and a bitset, unknown codes are dropped and reported,
+    and repeated codes are kept once.
+    """
+    requirements = [
+        {"name": "CS", "needed": "=1", "candidates": ["CS 101.A", "PHYS 101.A", "CS 101.B", "CS 101.A"]},
+        {"requirement_name": "Math", "needed": "<=1", "candidates": ["MATH 102.A"]},
+    ]
+    plan = compile_requirements(requirements, courses)
+
+    cs, math = plan
+    assert cs.name == "CS" and math.name == "Math"
+    assert cs.candidate_codes == ("CS 101.A", "CS 101.B")
+    assert [plan.table.codes[section_id] for section_id in cs.candidate_ids] == ["CS 101.A", "CS 101.B"]
+    assert cs.mask == sum(1 << section_id for section_id in cs.candidate_ids)
+    assert (cs.min_count, cs.max_count) == (1, 1)
+    assert plan.unknown_codes == ("PHYS 101.A",)
+    assert len(plan.table) == 3
+
+
+@pytest.mark.parametrize("requirement", [
+    {"name": "No condition", "candidates": ["CS 101.A"]},
+    {"name": "Bad condition", "needed": "two", "candidates": ["CS 101.A"]},
+    {"name": "No candidates", "needed": "=1"},
+    {"name": "Candidates not a list", "needed": "=1", "candidates": "CS 101.A"},
+])
+def test_compile_requirements_rejects_malformed_requirements(courses, requirement):
+    with pytest.raises(RequirementError, match=requirement["name"]):
+        compile_requirements([requirement], courses)
+
+
+def test_requirement_plan_is_immutable(courses):
+    plan = compile_requirements([{"name": "CS", "needed": "=1", "candidates": ["CS 101.A"]}], courses)
+
+    with pytest.raises(AttributeError):
+        plan.requirements = ()
+    with pytest.raises(AttributeError):
+        plan[0].max_count = 5
+
+
+def test_ordered_plan_puts_the_most_constrained_requirement_first(courses):
+    requirements = [
+        {"name": "Electives", "needed": "<=2", "candidates": ["CS 101.B", "MATH 102.A"]},
+        {"name": "CS", "needed": "=1", "candidates": ["CS 101.A"]},
+    ]
+    plan = compile_requirements(requirements, courses).ordered()
+
+    assert [req.name for req in plan] == ["CS", "Electives"]
+    assert plan.order == (1, 0)
+    # Every section clashes with the others here, so candidates keep their relative order
+    assert plan[1].candidate_codes == ("CS 101.B", "MATH 102.A")
+    assert plan[1].positions == (0, 1)
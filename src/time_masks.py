@@ -0,0 +1,134 @@
+# src/time_masks.py
+"""Time-string helpers and weekly occupancy bitmasks for course schedules."""
+
+# Width of one bit in an occupancy mask, in minutes. Class times in the
+# catalog are on a 10-minute grid, so 5 minutes keeps every boundary exact.
+MASK_RESOLUTION_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // MASK_RESOLUTION_MINUTES
+
+# Day names as they appear in the course file, plus English aliases.
+# Each day owns a block of SLOTS_PER_DAY bits in an occupancy mask.
+DAY_INDEX = {
+    "Pazartesi": 0, "Salı": 1, "Çarşamba": 2, "Perşembe": 3, "Cuma": 4, "Cumartesi": 5, "Pazar": 6,
+    "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6,
+}
+_extra_day_index = {}
+
+
+def day_index(day):
+    """Returns the mask block index of a day name; unknown names get their own block."""
+    index = DAY_INDEX.get(day)
+    if index is None:
+        index = _extra_day_index.setdefault(day, 7 + len(_extra_day_index))
+    return index
+
+
+# Helper function to convert a time string to a datetime object (for comparison)
+def time_to_minutes(time_str) -> int:
+    """Convert time in 'HH.MM' format to total minutes"""
+    hours, minutes = map(int, time_str.split("."))
+    return hours * 60 + minutes
+
+
+# Helper function to convert a time string to a datetime object (for comparison)
+def minutes_to_time(minutes_int) -> str:
+    hours, minutes = divmod(minutes_int, 60)
+    hours = str(hours)
+    minutes = str(minutes)
+    if len(hours) == 1:
+        hours = "0" + hours
+    if len(minutes) == 1:
+        minutes = "0" + minutes
+    return hours + '.' + minutes
+
+
+# Helper function to parse the schedule string
+def parse_time_slot(time_slot_str):
+    """Parse a schedule string and return a list of (day, start_time, end_time) tuples"""
+    day = time_slot_str["day"]
+    start_time, end_time = time_slot_str["interval"].split("-")
+    return day, time_to_minutes(start_time), time_to_minutes(end_time)
+
+
+def schedule_to_mask(schedule):
+    """
+    Builds the weekly occupancy bitmask of a schedule.
+
+    Every bit covers MASK_RESOLUTION_MINUTES of one day. Interval starts are
+    rounded down and ends rounded up, so two schedules overlap exactly when
+    their masks share a bit.
+
+    Args:
+        schedule (list): Schedule dictionaries (e.g., [{'day': 'Pazartesi', 'interval': '09.00-10.00'}]).
+
+    Returns:
+        int: The occupancy mask (0 for an empty schedule).
+    """
+    mask = 0
+    for slot in schedule:
+        day, start, end = parse_time_slot(slot)
+        first = start // MASK_RESOLUTION_MINUTES
+        last = -(-end // MASK_RESOLUTION_MINUTES)  # Ceiling division
+        if last <= first:
+            continue
+        offset = day_index(day) * SLOTS_PER_DAY
+        mask |= ((1 << (last - first)) - 1) << (offset + first)
+    return mask
+
+
+def _day_spans(mask):
+    """Yields (first slot, end slot, occupied slots) for every day block of an occupancy mask that has a class."""
+    day_slots = (1 << SLOTS_PER_DAY) - 1
+    while mask:
+        day = mask & day_slots
+        if day:
+            yield (day & -day).bit_length() - 1, day.bit_length(), day.bit_count()
+        mask >>= SLOTS_PER_DAY
+
+
+def idle_minutes(mask):
+    """
+    Returns the minutes of a week that lie between the first and last class of their day but
+    are not occupied by any class in an occupancy mask.
+    """
+    return sum(end - first - occupied for first, end, occupied in _day_spans(mask)) * MASK_RESOLUTION_MINUTES
+
+
+def earliest_start(mask):
+    """Returns the earliest time of day any class starts in an occupancy mask, in minutes after midnight (0 if empty)."""
+    return min((first for first, _, _ in _day_spans(mask)), default=0) * MASK_RESOLUTION_MINUTES
+
+
+def latest_finish(mask):
+    """Returns the latest time of day any class ends in an occupancy mask, in minutes after midnight (0 if empty)."""
+    return max((end for _, end, _ in _day_spans(mask)), default=0) * MASK_RESOLUTION_MINUTES
+
+
+def longest_day(mask):
+    """Returns the longest span from the first class to the end of the last one on a day, in minutes (0 if empty)."""
+    return max((end - first for first, end, _ in _day_spans(mask)), default=0) * MASK_RESOLUTION_MINUTES
+
+
+def schedule_minutes(schedule):
+    """Returns the total scheduled minutes per week."""
+    total = 0
+    for slot in schedule:
+        _, start, end = parse_time_slot(slot)
+        total += end - start
+    return total
+
+
+def schedule_to_day_mask(schedule):
+    """Builds a mask with one bit per day (bit day_index(day)) the schedule meets on."""
+    mask = 0
+    for slot in schedule:
+        mask |= 1 << day_index(slot["day"])
+    return mask
+
+
+def days_to_time_mask(days):
+    """Builds an occupancy mask covering every slot of the given days."""
+    mask = 0
+    for day in days:
+        mask |= ((1 << SLOTS_PER_DAY) - 1) << (day_index(day) * SLOTS_PER_DAY)
+    return mask